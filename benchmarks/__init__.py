@@ -0,0 +1 @@
+"""Benchmarks for random-string-detector."""
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Allocation profile of the word-scoring path, by input class.
+
+For is_random_word, for __call__ on documents and for each TextPreprocessing
+stage, reports per call:
+- peak: bytes allocated above the starting point at the call's high-water mark
+  (tracemalloc peak), i.e. the transient memory the call churns through
+- retained: bytes and blocks still allocated after the call returned (leaks or
+  caches growing)
+- gc/10k: garbage collections the calls triggered per 10,000 calls, which is
+  what allocation churn costs long-running services in pauses
+
+tracemalloc tracks live and peak memory, not a running total of allocations,
+so peak bytes is the churn figure and blocks are counted once calls return.
+
+Usage: python -m benchmarks.allocations [--calls N]
+"""
+
+import argparse
+import gc
+import statistics
+import tracemalloc
+
+from random_string_detector import RandomStringDetector
+from random_string_detector.preprocessing import TextPreprocessing
+from benchmarks.common import INPUT_CLASSES, make_words
+
+STOPWORDS = ['the', 'over', 'a', 'of', 'and', 'to']
+
+
+def _profile(function, inputs, calls: int):
+    """Profile function over inputs (cycled for `calls` calls).
+
+    Returns:
+    - dict with the median peak bytes per call, retained bytes and blocks per
+      call, and garbage collections per 10,000 calls
+    """
+    inputs = [inputs[i % len(inputs)] for i in range(calls)]
+    for value in inputs[:10]:  # warm up lazy state, e.g. regex caches
+        function(value)
+
+    collections = []
+
+    def on_gc(phase, info):
+        if phase == 'start':
+            collections.append(info['generation'])
+
+    peaks = [0] * calls
+    tracemalloc.start()
+    gc.callbacks.append(on_gc)
+    try:
+        before = tracemalloc.take_snapshot()
+        # Only count the collections triggered by the calls, not by the profiler
+        gc.collect()
+        collections.clear()
+        for index, value in enumerate(inputs):
+            current = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+            function(value)
+            peaks[index] = tracemalloc.get_traced_memory()[1] - current
+        num_collections = len(collections)
+        after = tracemalloc.take_snapshot()
+    finally:
+        gc.callbacks.remove(on_gc)
+        tracemalloc.stop()
+
+    # Ignore the profiler's own allocations
+    differences = [stat for stat in after.compare_to(before, 'filename')
+                   if stat.traceback[0].filename != __file__]
+    return {
+        'peak_bytes': statistics.median(peaks),
+        'retained_bytes': sum(stat.size_diff for stat in differences) / calls,
+        'retained_blocks': sum(stat.count_diff for stat in differences) / calls,
+        'gc_per_10k': 10000 * num_collections / calls,
+    }
+
+
+def _print(label, result):
+    print(f"{label:<34}{result['peak_bytes']:>10.0f}B{result['retained_bytes']:>12.1f}B"
+          f"{result['retained_blocks']:>10.2f}{result['gc_per_10k']:>10.1f}")
+
+
+def run_benchmark(calls: int = 2000):
+    detector = RandomStringDetector(allow_numbers=True)
+    preprocessing = TextPreprocessing(stopwords=STOPWORDS)
+    stages = {
+        'remove_accents': preprocessing.remove_accents,
+        'remove_punctuation': preprocessing.remove_punctuation,
+        'remove_stopwords': preprocessing.remove_stopwords,
+        'non_ascii_to_ascii': preprocessing.non_ascii_to_ascii,
+        '__call__': preprocessing,
+    }
+
+    print("ALLOCATION BENCHMARK")
+    print("=" * 78)
+    print(f"{'path':<34}{'peak':>11}{'retained':>13}{'blocks':>10}{'gc/10k':>10}")
+    results = {}
+    for input_class in INPUT_CLASSES:
+        words = make_words(input_class, 200)
+        documents = [' '.join(words[i:i + 8]) for i in range(0, len(words), 8)]
+        print("-" * 78)
+        print(input_class)
+        results[input_class] = {
+            'is_random_word': _profile(detector.is_random_word, words, calls),
+            'detector': _profile(detector, documents, calls),
+        }
+        _print('  is_random_word', results[input_class]['is_random_word'])
+        _print('  detector(document)', results[input_class]['detector'])
+        for stage, function in stages.items():
+            results[input_class][stage] = _profile(function, documents, calls)
+            _print(f'  preprocessing.{stage}', results[input_class][stage])
+
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--calls", type=int, default=2000, help="calls per measurement")
+    args = parser.parse_args()
+    run_benchmark(args.calls)
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Benchmark of the allow_numbers path on UUIDs, hashes and license keys.
+
+Compares scoring with the per-word feature record against recomputing the
+word-level features for every digit-containing bigram.
+
+Usage: python -m benchmarks.allow_numbers [--number N]
+"""
+
+import argparse
+import timeit
+from random_string_detector import RandomStringDetector
+
+INPUTS = {
+    "uuid": [
+        "123e4567-e89b-12d3-a456-426614174000",
+        "550e8400-e29b-41d4-a716-446655440000",
+        "f47ac10b-58cc-4372-a567-0e02b2c3d479",
+    ],
+    "hash": [
+        "a1b2c3d4e5f6",
+        "d41d8cd98f00b204e9800998ecf8427e",
+        "da39a3ee5e6b4b0d3255bfef95601890afd80709",
+        "e3b0c44298fc1c149afbf4c8996fb92427ae41e4649b934ca495991b7852b855",
+    ],
+    "license_key": [
+        "AB12-CD34-EF56",
+        "XK7P2-9QWRT-M4N8B-ZL3VC-H6YJD",
+        "3F9A-7C21-B8E4-0D56",
+    ],
+    "username": [
+        "chicagofan23",
+        "basketballfan99",
+        "johnsmith1985",
+    ],
+}
+
+
+def _score_recomputing(detector, word):
+    """Score the digit bigrams of a word, recomputing word features per bigram."""
+    word = word.lower()
+    for i in range(len(word) - 1):
+        bigram = word[i:i + 2]
+        if any(c.isdigit() for c in bigram):
+            detector._is_likely_random_alphanumeric_bigram(bigram, word)
+
+
+def _score_memoized(detector, word):
+    """Score the digit bigrams of a word, sharing one feature record."""
+    word = word.lower()
+    features = None
+    for i in range(len(word) - 1):
+        bigram = word[i:i + 2]
+        if any(c.isdigit() for c in bigram):
+            if features is None:
+                features = detector._word_features(word)
+            detector._is_likely_random_alphanumeric_bigram(bigram, word, features)
+
+
+def run_benchmark(number: int = 20000):
+    detector = RandomStringDetector(allow_numbers=True)
+
+    print("ALLOW_NUMBERS BENCHMARK")
+    print("=" * 70)
+    print(f"{'input class':<14}{'recomputed':>14}{'memoized':>14}{'speedup':>10}{'is_random_word':>18}")
+    print("-" * 70)
+
+    results = {}
+    for name, words in INPUTS.items():
+        recomputed = min(timeit.repeat(
+            lambda: [_score_recomputing(detector, w) for w in words], number=number, repeat=3))
+        memoized = min(timeit.repeat(
+            lambda: [_score_memoized(detector, w) for w in words], number=number, repeat=3))
+        full = min(timeit.repeat(
+            lambda: [detector.is_random_word(w) for w in words], number=number, repeat=3))
+        per_word = 1e6 / (number * len(words))
+        results[name] = {
+            'recomputed_us': recomputed * per_word,
+            'memoized_us': memoized * per_word,
+            'is_random_word_us': full * per_word,
+        }
+        print(f"{name:<14}{recomputed * per_word:>12.2f}us{memoized * per_word:>12.2f}us"
+              f"{recomputed / memoized:>9.1f}x{full * per_word:>16.2f}us")
+
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--number", type=int, default=20000, help="iterations per measurement")
+    args = parser.parse_args()
+    run_benchmark(args.number)
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Cold-start benchmark: import, first construction and first call in fresh interpreters.
+
+Each run starts a new interpreter with `-X importtime` that imports the
+package, then for every bundled bigram table constructs a detector and scores
+a first document, and finally preprocesses a first accented text (the first
+unidecode call loads its transliteration tables). The slowest modules of the
+import are listed from the `-X importtime` breakdown.
+
+The median total over the runs must stay within `--budget-ms`, otherwise the
+benchmark exits 1. Phases are timed inside the probe, so they include the small
+overhead of -X importtime itself.
+
+Usage: python -m benchmarks.cold_start [--runs N] [--budget-ms MS] [--top N]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+# Runs in the fresh interpreter; prints the phase timings as JSON
+_PROBE = r'''
+import json, time
+timings = {}
+start = time.perf_counter()
+import random_string_detector
+from random_string_detector import RandomStringDetector, bigrams
+timings['import'] = time.perf_counter() - start
+
+for name in sorted(bigrams.TABLES):
+    start = time.perf_counter()
+    detector = RandomStringDetector(bigrams_probs=getattr(bigrams, name))
+    timings[name + ' construct'] = time.perf_counter() - start
+    start = time.perf_counter()
+    detector("hello world aowkaoskaos")
+    timings[name + ' first call'] = time.perf_counter() - start
+
+start = time.perf_counter()
+from random_string_detector.preprocessing import TextPreprocessing
+timings['import preprocessing'] = time.perf_counter() - start
+start = time.perf_counter()
+TextPreprocessing()("Olá, café com açúcar!")
+timings['preprocessing first call'] = time.perf_counter() - start
+print(json.dumps(timings))
+'''
+
+
+def _parse_importtime(stderr: str):
+    """Parse `-X importtime` output into {module: (self us, cumulative us)}."""
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, module = line[len('import time:'):].split('|')
+        modules[module.strip()] = (int(self_us), int(cumulative_us))
+    return modules
+
+
+def _run_once():
+    """Run the probe in a fresh interpreter.
+
+    Returns:
+    - (phase timings in seconds, import breakdown)
+    """
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [root, os.environ.get('PYTHONPATH')])))
+    # -I would drop PYTHONPATH; skip user site-packages and bytecode writes instead,
+    # but keep existing bytecode, as a deployed function would
+    process = subprocess.run(
+        [sys.executable, '-s', '-B', '-X', 'importtime', '-c', _PROBE],
+        capture_output=True, text=True, env=env, check=True)
+    return json.loads(process.stdout), _parse_importtime(process.stderr)
+
+
+def run_benchmark(runs: int = 5, budget_ms: float = 250.0, top: int = 12) -> int:
+    phases = {}
+    imports = {}
+    for _ in range(runs):
+        timings, breakdown = _run_once()
+        for phase, seconds in timings.items():
+            phases.setdefault(phase, []).append(seconds * 1000)
+        for module, (self_us, cumulative_us) in breakdown.items():
+            imports.setdefault(module, []).append((self_us / 1000, cumulative_us / 1000))
+
+    print("COLD START BENCHMARK")
+    print("=" * 68)
+    print(f"Python {sys.version.split()[0]}, {runs} fresh interpreters (medians)")
+    print(f"{'phase':<40}{'ms':>10}")
+    print("-" * 68)
+    medians = {phase: statistics.median(values) for phase, values in phases.items()}
+    for phase, ms in medians.items():
+        print(f"{phase:<40}{ms:>10.2f}")
+    total = sum(medians.values())
+    print(f"{'total':<40}{total:>10.2f}")
+
+    print()
+    print(f"Slowest imports (-X importtime), top {top} by self time")
+    print(f"{'module':<44}{'self ms':>10}{'cumul. ms':>12}")
+    print("-" * 68)
+    summary = {module: (statistics.median(s for s, _ in values), statistics.median(c for _, c in values))
+               for module, values in imports.items()}
+    for module, (self_ms, cumulative_ms) in sorted(summary.items(), key=lambda item: -item[1][0])[:top]:
+        print(f"{module:<44}{self_ms:>10.2f}{cumulative_ms:>12.2f}")
+
+    print()
+    if total > budget_ms:
+        print(f"Over budget: {total:.1f} ms > {budget_ms:.1f} ms")
+        return 1
+    print(f"Within budget: {total:.1f} ms <= {budget_ms:.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5, help="fresh interpreters to start")
+    parser.add_argument("--budget-ms", type=float, default=250.0,
+                        help="maximum median cold-start time, all phases together")
+    parser.add_argument("--top", type=int, default=12, help="slowest imports to list")
+    args = parser.parse_args()
+    sys.exit(run_benchmark(args.runs, args.budget_ms, args.top))
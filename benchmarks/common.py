@@ -0,0 +1,74 @@
+"""Shared inputs and helpers for the benchmarks."""
+import random
+import string
+import uuid
+
+from random_string_detector.detector import KEYBOARD_PATTERNS
+
+NATURAL_WORDS = [
+    "hello", "world", "computer", "programming", "algorithm", "the", "quick", "brown",
+    "fox", "jumps", "over", "lazy", "dog", "password", "admin", "sample", "weather",
+    "morning", "coffee", "language", "detector", "between", "question", "because",
+    "government", "information", "development", "together", "important", "children",
+    "system", "number", "people", "through", "country", "problem", "service", "change",
+]
+
+
+def alphabetic_word(rng: random.Random) -> str:
+    """A natural-language word."""
+    return rng.choice(NATURAL_WORDS)
+
+
+def random_letters(rng: random.Random) -> str:
+    """A string of random letters, like random typing."""
+    return ''.join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(5, 12)))
+
+
+def alphanumeric_word(rng: random.Random) -> str:
+    """A username with a digit suffix."""
+    return rng.choice(NATURAL_WORDS) + str(rng.randint(1, 2024))
+
+
+def keyboard_walk(rng: random.Random) -> str:
+    """A slice of at least 4 characters of a keyboard pattern."""
+    pattern = rng.choice([p for p in KEYBOARD_PATTERNS if len(p) >= 4])
+    start = rng.randint(0, len(pattern) - 4)
+    return pattern[start:rng.randint(start + 4, len(pattern))]
+
+
+def uuid_string(rng: random.Random) -> str:
+    """A random UUID in canonical form."""
+    return str(uuid.UUID(int=rng.getrandbits(128), version=4))
+
+
+def long_hash(rng: random.Random) -> str:
+    """A SHA-256 style hex digest."""
+    return '%064x' % rng.getrandbits(256)
+
+
+INPUT_CLASSES = {
+    'alphabetic': alphabetic_word,
+    'random_letters': random_letters,
+    'alphanumeric': alphanumeric_word,
+    'keyboard_walk': keyboard_walk,
+    'uuid': uuid_string,
+    'long_hash': long_hash,
+}
+
+
+def make_words(input_class: str, n: int, seed: int = 0):
+    """Generate n words of one input class."""
+    rng = random.Random(seed)
+    generate = INPUT_CLASSES[input_class]
+    return [generate(rng) for _ in range(n)]
+
+
+def make_documents(n: int, words_per_document: int = 8, seed: int = 0):
+    """Generate n documents mixing all input classes, mostly natural words."""
+    rng = random.Random(seed)
+    generators = list(INPUT_CLASSES.values())
+    weights = [10, 1, 2, 1, 1, 1]
+    return [
+        ' '.join(rng.choices(generators, weights)[0](rng) for _ in range(words_per_document))
+        for _ in range(n)
+    ]
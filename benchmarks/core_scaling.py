@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Core-scaling benchmark of the parallel scoring path (RandomStringDetector.batch()).
+
+Scores a fixed, seeded corpus (benchmarks.corpus) with 1..N processes and
+1..N threads, and reports for each worker count:
+- throughput (documents/s) and speedup over one worker
+- parallel efficiency (speedup / workers)
+- peak memory: the largest resident set of a worker process (forked workers
+  share the parent's pages, which are included), or of the whole process for
+  threads, which share one address space
+
+Each measurement runs in a fresh interpreter, so that peak memory figures do
+not carry over between runs. Threads only scale on free-threaded (no-GIL)
+builds; on regular builds they show the cost of the GIL instead.
+
+Usage: python -m benchmarks.core_scaling [--documents N] [--max-workers N] [--no-threads]
+"""
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+
+from random_string_detector import RandomStringDetector
+from random_string_detector.parallel import gil_enabled
+from benchmarks.corpus import iter_corpus
+
+
+def make_corpus(num_documents: int, words_per_document: int = 8, seed: int = 0):
+    """Build the fixed corpus of documents from the synthetic token stream."""
+    tokens = [token for token, _, _ in iter_corpus(num_documents * words_per_document, seed)]
+    return [' '.join(tokens[i:i + words_per_document]) for i in range(0, len(tokens), words_per_document)]
+
+
+def _maxrss_mb(who) -> float:
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    scale = 1 if sys.platform == 'darwin' else 1024
+    return resource.getrusage(who).ru_maxrss * scale / 2 ** 20
+
+
+def measure(mode: str, workers: int, num_documents: int, seed: int = 0, repeat: int = 3):
+    """Score the corpus with `workers` processes or threads, in this process.
+
+    Returns:
+    - dict with the best time in seconds and peak memory in MiB
+    """
+    detector = RandomStringDetector(allow_numbers=True)
+    documents = make_corpus(num_documents, seed=seed)
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        detector.batch(documents, max_workers=workers, processes=mode == 'processes')
+        best = min(best, time.perf_counter() - start)
+    if mode == 'processes' and workers > 1:
+        worker_mb = _maxrss_mb(resource.RUSAGE_CHILDREN)
+    else:
+        worker_mb = _maxrss_mb(resource.RUSAGE_SELF)
+    return {'seconds': best, 'worker_mb': worker_mb}
+
+
+def _measure_in_subprocess(mode: str, workers: int, num_documents: int, seed: int):
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [root, os.environ.get('PYTHONPATH')])))
+    process = subprocess.run(
+        [sys.executable, '-m', 'benchmarks.core_scaling', '--measure', mode, str(workers),
+         '--documents', str(num_documents), '--seed', str(seed)],
+        capture_output=True, text=True, env=env, check=True)
+    return json.loads(process.stdout)
+
+
+def _worker_counts(max_workers: int):
+    counts = []
+    count = 1
+    while count < max_workers:
+        counts.append(count)
+        count *= 2
+    counts.append(max_workers)
+    return counts
+
+
+def run_benchmark(num_documents: int = 20000, max_workers: int = None, threads: bool = True, seed: int = 0):
+    max_workers = max_workers or os.cpu_count() or 1
+    modes = ['processes', 'threads'] if threads else ['processes']
+
+    print("CORE SCALING BENCHMARK")
+    print("=" * 72)
+    print(f"CPUs: {os.cpu_count()}, GIL enabled: {gil_enabled()}, documents: {num_documents}")
+    results = {}
+    for mode in modes:
+        print("-" * 72)
+        print(f"{mode:<10}{'workers':>8}{'docs/s':>12}{'speedup':>10}{'efficiency':>12}{'peak MiB':>12}")
+        results[mode] = {}
+        for workers in _worker_counts(max_workers):
+            result = _measure_in_subprocess(mode, workers, num_documents, seed)
+            result['throughput'] = num_documents / result['seconds']
+            result['speedup'] = result['throughput'] / results[mode][1]['throughput'] if results[mode] else 1.0
+            result['efficiency'] = result['speedup'] / workers
+            results[mode][workers] = result
+            print(f"{'':<10}{workers:>8}{result['throughput']:>12.0f}{result['speedup']:>9.2f}x"
+                  f"{result['efficiency']:>12.0%}{result['worker_mb']:>12.1f}")
+
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--documents", type=int, default=20000, help="documents in the corpus")
+    parser.add_argument("--max-workers", type=int, default=None, help="default: number of CPUs")
+    parser.add_argument("--no-threads", action="store_true", help="only measure processes")
+    parser.add_argument("--seed", type=int, default=0, help="corpus seed")
+    parser.add_argument("--measure", nargs=2, metavar=("MODE", "WORKERS"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.measure:
+        mode, workers = args.measure
+        print(json.dumps(measure(mode, int(workers), args.documents, args.seed)))
+    else:
+        run_benchmark(args.documents, args.max_workers, not args.no_threads, args.seed)
@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+Seeded, streaming generator of labelled synthetic corpora for scaling benchmarks.
+
+Tokens are drawn from a controlled mix of input classes: natural-language
+words (a fixed word list, and pseudo-words chained from the bigram table),
+usernames with digit suffixes, keyboard walks from KEYBOARD_PATTERNS, UUIDs,
+hex hashes and random letters. Each token carries its class and a label,
+"1" for classes that are random typing and "0" for the others, so accuracy can
+be measured along with throughput.
+
+Corpora are written as TSV (token, class, label), gzip-compressed if the path
+ends in .gz. Tokens are generated in blocks of BLOCK_SIZE, each seeded from
+the corpus seed and the block number, so a corpus of any size streams in
+constant memory, and any part of it (--start) can be regenerated or produced
+in parallel and concatenated, byte for byte identical.
+
+Usage:
+    python -m benchmarks.corpus corpus.tsv.gz --tokens 1000000000 --seed 1
+    python -m benchmarks.corpus part2.tsv --tokens 1000000 --start 1000000 --mix natural=8,uuid=1
+"""
+
+import argparse
+import gzip
+import io
+import random
+import sys
+from itertools import accumulate
+from typing import Dict, Iterator, Mapping, Optional, Tuple
+
+from random_string_detector import bigrams
+from benchmarks.common import (alphabetic_word, alphanumeric_word, keyboard_walk,
+                               random_letters, uuid_string)
+
+BLOCK_SIZE = 1 << 16
+
+# Input class -> whether it is random typing
+LABELS = {
+    'natural': False,
+    'bigram_word': False,
+    'username': False,
+    'keyboard_walk': True,
+    'uuid': True,
+    'hex_hash': True,
+    'random_letters': True,
+}
+
+DEFAULT_MIX = {
+    'natural': 40,
+    'bigram_word': 20,
+    'username': 15,
+    'keyboard_walk': 5,
+    'uuid': 5,
+    'hex_hash': 5,
+    'random_letters': 10,
+}
+
+
+class _BigramChain(object):
+    """Pseudo-word generator: a character chain weighted by a bigram table."""
+
+    def __init__(self, table: Mapping[str, float]):
+        pairs = [(bigram, prob) for bigram, prob in table.items()
+                 if len(bigram) == 2 and bigram.isalpha() and prob > 0]
+        self.starts = [bigram for bigram, _ in pairs]
+        self.start_weights = list(accumulate(prob for _, prob in pairs))
+        following = {}
+        for bigram, prob in pairs:
+            following.setdefault(bigram[0], []).append((bigram[1], prob))
+        self.next = {
+            first: ([c for c, _ in options], list(accumulate(prob for _, prob in options)))
+            for first, options in following.items()
+        }
+
+    def word(self, rng: random.Random) -> str:
+        """Generate a pseudo-word of 4 to 10 characters."""
+        length = rng.randint(4, 10)
+        characters = list(rng.choices(self.starts, cum_weights=self.start_weights)[0])
+        while len(characters) < length:
+            options = self.next.get(characters[-1])
+            if options is None:
+                break
+            characters.append(rng.choices(options[0], cum_weights=options[1])[0])
+        return ''.join(characters)
+
+
+def _hex_hash(rng: random.Random) -> str:
+    """An MD5, SHA-1 or SHA-256 style hex digest."""
+    digits = rng.choice((32, 40, 64))
+    return '%0*x' % (digits, rng.getrandbits(4 * digits))
+
+
+def make_generators(table: Mapping[str, float] = bigrams.ENGLISH) -> Dict[str, object]:
+    """Get the token generator of each input class, natural pseudo-words following table."""
+    chain = _BigramChain(table)
+    return {
+        'natural': alphabetic_word,
+        'bigram_word': chain.word,
+        'username': alphanumeric_word,
+        'keyboard_walk': keyboard_walk,
+        'uuid': uuid_string,
+        'hex_hash': _hex_hash,
+        'random_letters': random_letters,
+    }
+
+
+def iter_corpus(num_tokens: int, seed: int = 0, mix: Optional[Mapping[str, float]] = None,
+                table: Mapping[str, float] = bigrams.ENGLISH,
+                start: int = 0) -> Iterator[Tuple[str, str, bool]]:
+    """Lazily generate a labelled corpus.
+
+    Args:
+    - num_tokens: number of tokens
+    - seed: corpus seed; the same seed, mix and table give the same corpus
+    - mix: relative weight of each input class (default DEFAULT_MIX)
+    - table: bigram table the pseudo-words follow
+    - start: index of the first token, to generate a part of a larger corpus
+
+    Returns:
+    - iterator of (token, input class, is random typing)
+    """
+    mix = dict(mix or DEFAULT_MIX)
+    unknown = set(mix) - set(LABELS)
+    if unknown:
+        raise ValueError(f"unknown input classes: {', '.join(sorted(unknown))}")
+    generators = make_generators(table)
+    classes = [name for name, weight in mix.items() if weight > 0]
+    if not classes:
+        raise ValueError("the mix has no input class with a positive weight")
+    cum_weights = list(accumulate(mix[name] for name in classes))
+
+    end = start + num_tokens
+    block = start // BLOCK_SIZE
+    while block * BLOCK_SIZE < end:
+        # String seeds are hashed with SHA-512, stable across runs and platforms
+        rng = random.Random(f"{seed}:{block}")
+        first = block * BLOCK_SIZE
+        chosen = rng.choices(classes, cum_weights=cum_weights, k=BLOCK_SIZE)
+        tokens = [generators[name](rng) for name in chosen]
+        for index in range(max(start, first), min(end, first + BLOCK_SIZE)):
+            name = chosen[index - first]
+            yield tokens[index - first], name, LABELS[name]
+        block += 1
+
+
+def write_corpus(destination, num_tokens: int, seed: int = 0, mix: Optional[Mapping[str, float]] = None,
+                 table: Mapping[str, float] = bigrams.ENGLISH, start: int = 0) -> Dict[str, int]:
+    """Write a labelled corpus as TSV lines of token, input class and label (1 or 0).
+
+    Args:
+    - destination: path (gzip-compressed if it ends in .gz, "-" for stdout) or text file
+    - other arguments: see iter_corpus
+
+    Returns:
+    - number of tokens written per input class
+    """
+    if isinstance(destination, str):
+        if destination == '-':
+            return _write(sys.stdout, num_tokens, seed, mix, table, start)
+        opener = gzip.open if destination.endswith('.gz') else open
+        with opener(destination, 'wt', encoding='utf-8', newline='') as f:
+            return _write(f, num_tokens, seed, mix, table, start)
+    return _write(destination, num_tokens, seed, mix, table, start)
+
+
+def _write(f, num_tokens, seed, mix, table, start):
+    counts = {}
+    buffer = io.StringIO()
+    for index, (token, name, label) in enumerate(iter_corpus(num_tokens, seed, mix, table, start), 1):
+        buffer.write(f"{token}\t{name}\t{'1' if label else '0'}\n")
+        counts[name] = counts.get(name, 0) + 1
+        if index % BLOCK_SIZE == 0:
+            f.write(buffer.getvalue())
+            buffer = io.StringIO()
+    f.write(buffer.getvalue())
+    return counts
+
+
+def read_corpus(source) -> Iterator[Tuple[str, str, bool]]:
+    """Lazily read a corpus written by write_corpus.
+
+    Returns:
+    - iterator of (token, input class, is random typing)
+    """
+    opener = gzip.open if isinstance(source, str) and source.endswith('.gz') else open
+    with (opener(source, 'rt', encoding='utf-8', newline='') if isinstance(source, str) else source) as f:
+        for line in f:
+            token, name, label = line.rstrip('\n').split('\t')
+            yield token, name, label == '1'
+
+
+def parse_mix(text: str) -> Dict[str, float]:
+    """Parse a mix such as "natural=8,uuid=1" (classes not listed get no tokens)."""
+    mix = {}
+    for part in text.split(','):
+        name, _, weight = part.partition('=')
+        mix[name.strip()] = float(weight) if weight else 1.0
+    return mix
+
+
+def main(argv=None):
+    tables = {name.lower(): name for name in bigrams.TABLES}
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("destination", help="output TSV file (.gz to compress, - for stdout)")
+    parser.add_argument("--tokens", type=int, default=1000000, help="number of tokens")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--start", type=int, default=0, help="index of the first token")
+    parser.add_argument("--mix", type=parse_mix, default=None,
+                        help=f"input class weights (default: "
+                             f"{','.join(f'{k}={v}' for k, v in DEFAULT_MIX.items())})")
+    parser.add_argument("--table", choices=sorted(tables), default='english',
+                        help="bigram table for the pseudo-words")
+    args = parser.parse_args(argv)
+    counts = write_corpus(args.destination, args.tokens, args.seed, args.mix,
+                          getattr(bigrams, tables[args.table]), args.start)
+    if args.destination != '-':
+        for name, count in sorted(counts.items()):
+            print(f"{name:<16}{count:>14}")
+
+
+if __name__ == "__main__":
+    main()
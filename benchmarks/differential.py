@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+"""
+Differential fuzz harness: optimized detector engines against the frozen reference.
+
+Generates random, adversarial, realistic and long tokens, scores them with the
+frozen reference detector (benchmarks.reference) and with every engine, and
+reports each disagreement together with the speed of each engine relative to
+the reference on the same inputs. Exits 1 if any engine disagrees.
+
+Engines are registered in ENGINES (token verdicts) and DOCUMENT_ENGINES
+(document verdicts); a new engine only has to give the same verdicts.
+
+Usage: python -m benchmarks.differential [--tokens N] [--seed N] [--config NAME ...]
+"""
+
+import argparse
+import pickle
+import random
+import string
+import sys
+import time
+
+from random_string_detector import RandomStringDetector
+from random_string_detector.bigrams import FRENCH_WITHOUT_ACCENTS
+from random_string_detector.detector import KEYBOARD_PATTERNS, has_sequential_run
+from random_string_detector.shared import SharedBigramTable, SharedVerdictCache
+from benchmarks.common import INPUT_CLASSES
+from benchmarks.reference import ReferenceDetector
+
+from random_string_detector import vectorized
+from random_string_detector.vectorized import encode_words, has_sequential_run_batch, screen_words
+
+# The vectorized module imports without numpy, but its functions need it
+HAS_NUMPY = vectorized.np is not None
+
+# Detector settings every engine is checked with
+CONFIGS = {
+    'default': {},
+    'allow_numbers': {'allow_numbers': True},
+    'french': {'bigrams_probs': FRENCH_WITHOUT_ACCENTS},
+    'negative_common': {'common_bigrams_threshold': -1.0, 'allow_numbers': True},
+    'loose': {'common_bigrams_threshold': 0.0, 'uncommon_bigrams_threshold': 0.3,
+              'duplicated_bigrams_threshold': 0.0},
+    'repetitive': {'common_bigrams_threshold': -1.0, 'duplicated_bigrams_threshold': 0.95,
+                   'allow_numbers': True},
+}
+
+# Characters that exercise the str predicates: Unicode digits and letters,
+# case mappings that change length, combining marks and odd whitespace
+_ODD_CHARACTERS = '²³¹٣٤５６ⅷ①ßİıſǅΣςﬁé́​  \x1c﻿🙂'
+_ADVERSARIAL_PARTS = [
+    'a', 'aaaa', 'ab', 'abcd', 'dcba', 'wxyz', 'qwer', 'QWER', 'asdf', 'zxcv', 'poiu', '1234',
+    '4321', '7890', '0000', 'ff', 'deadbeef', 'x', 'q', 'th', 'ing', '-', '_', '.', '@', '9', '23',
+] + list(_ODD_CHARACTERS)
+
+
+def random_token(rng: random.Random) -> str:
+    """A token of random characters from ASCII and a few odd Unicode characters."""
+    alphabet = string.ascii_letters + string.digits + string.punctuation + _ODD_CHARACTERS
+    return ''.join(rng.choice(alphabet) for _ in range(rng.randint(0, 20)))
+
+
+def adversarial_token(rng: random.Random) -> str:
+    """A token built around the rules' edge cases: lengths 3-4 and 9-12, runs, hex, repeats."""
+    if rng.random() < 0.05:
+        # One letter repeated in mixed case: the same bigrams, but not the same character
+        return _mixed_case(rng, rng.choice(string.ascii_letters) * rng.randint(4, 24))
+    token = ''.join(rng.choice(_ADVERSARIAL_PARTS) for _ in range(rng.randint(1, 5)))
+    if rng.random() < 0.5:
+        # Cut at a length boundary of the rules
+        token = token[:rng.choice((3, 4, 5, 6, 8, 9, 10, 11, 12, 13))]
+    if rng.random() < 0.2:
+        token = token.upper()
+    elif rng.random() < 0.2:
+        token = _mixed_case(rng, token)
+    return token
+
+
+def _mixed_case(rng: random.Random, token: str) -> str:
+    """Change the case of random characters, e.g. 'aaaa' into 'aAAa'."""
+    return ''.join(c.swapcase() if rng.random() < 0.5 else c for c in token)
+
+
+def realistic_token(rng: random.Random) -> str:
+    """A token of one of the benchmark input classes, sometimes in mixed case."""
+    token = rng.choice(list(INPUT_CLASSES.values()))(rng)
+    if rng.random() < 0.1:
+        token = token.capitalize()
+    if rng.random() < 0.05:
+        token = rng.choice(KEYBOARD_PATTERNS)
+    return token
+
+
+def long_token(rng: random.Random) -> str:
+    """A long token: key-like strings, repetitive strings and concatenated words."""
+    alphabet = rng.choice((string.hexdigits, string.ascii_letters + string.digits + '+/_-',
+                           string.ascii_lowercase, string.ascii_lowercase + string.digits))
+    kind = rng.randrange(4)
+    if kind == 0:
+        return ''.join(rng.choice(alphabet) for _ in range(rng.randint(16, 80)))
+    if kind == 1:
+        token = ''.join(rng.choice(alphabet[:rng.randint(1, 6)]) for _ in range(rng.randint(16, 40)))
+        return _mixed_case(rng, token) if rng.random() < 0.5 else token
+    if kind == 2:
+        return ''.join(rng.choice(list(INPUT_CLASSES.values()))(rng) for _ in range(rng.randint(2, 4)))
+    return realistic_token(rng) + rng.choice(_ADVERSARIAL_PARTS) * rng.randint(4, 12)
+
+
+GENERATORS = {
+    'random': random_token,
+    'adversarial': adversarial_token,
+    'realistic': realistic_token,
+    'long': long_token,
+}
+
+
+def make_tokens(n: int, seed: int = 0):
+    """Generate n tokens of each generator."""
+    rng = random.Random(seed)
+    return [generate(rng) for generate in GENERATORS.values() for _ in range(n)]
+
+
+def make_documents(tokens, seed: int = 0):
+    """Join tokens into documents separated by assorted whitespace."""
+    rng = random.Random(seed)
+    separators = [' ', ' ', ' ', '  ', '\t', '\n', ' ', '\x1c', ' ']
+    documents = []
+    index = 0
+    while index < len(tokens):
+        size = rng.randint(1, 8)
+        parts = tokens[index:index + size]
+        documents.append(''.join(rng.choice(separators) + part for part in parts))
+        index += size
+    documents.append('')
+    return documents
+
+
+def _reference_sequential_run(text: str) -> bool:
+    """Sequential-letters check of the reference is_keyboard_pattern."""
+    for i in range(len(text) - 3):
+        if (ord(text[i+1]) - ord(text[i]) == 1 and
+                ord(text[i+2]) - ord(text[i+1]) == 1 and
+                ord(text[i+3]) - ord(text[i+2]) == 1):
+            return True
+    return False
+
+
+# Token engines: name -> function(detector) returning a scoring function of a
+# token list; it may have a close() method to release resources
+def _is_random_word(detector):
+    return lambda tokens: [detector.is_random_word(t) for t in tokens]
+
+
+def _explain(detector):
+    return lambda tokens: [detector.explain(t)[0] for t in tokens]
+
+
+def _pickled(detector):
+    restored = pickle.loads(pickle.dumps(detector))
+    return lambda tokens: [restored.is_random_word(t) for t in tokens]
+
+
+def _shared_table(detector):
+    table = SharedBigramTable.create(detector.bigrams)
+    shared = detector.replace(bigrams_probs=table)
+
+    def score(tokens):
+        return [shared.is_random_word(t) for t in tokens]
+    score.close = table.close
+    return score
+
+
+def _shared_cache(detector):
+    cache = SharedVerdictCache.create(detector.fingerprint, slots=1 << 12)
+    cached = detector.replace(cache=cache)
+
+    def score(tokens):
+        # The first run fills the cache, later runs are answered from it
+        return [cached.is_random_word(t) for t in tokens]
+    score.close = cache.close
+    return score
+
+
+def _prescreen(detector):
+    # Screen every token the screen accepts, not only the long ones
+    return lambda tokens: screen_words(detector, tokens, min_length=4)[0]
+
+
+ENGINES = {
+    'is_random_word': _is_random_word,
+    'explain': _explain,
+    'pickled': _pickled,
+    'shared_table': _shared_table,
+    'shared_cache': _shared_cache,
+}
+if HAS_NUMPY:
+    ENGINES['prescreen'] = _prescreen
+
+# Document engines: name -> function(detector) returning a scoring function of a document list
+DOCUMENT_ENGINES = {
+    '__call__': lambda detector: lambda documents: [detector(d) for d in documents],
+    'batch': lambda detector: lambda documents: detector.batch(documents, max_workers=2),
+}
+
+
+def _compare(name, reference_score, score, inputs, repeat: int = 3):
+    """Score inputs with an engine and the reference, taking the best of `repeat` timings.
+
+    The verdicts of every run are checked, so that engines with state (caches)
+    are checked both cold and warm.
+
+    Returns:
+    - (list of disagreeing (input, reference verdict, engine verdict), speed relative to the reference)
+    """
+    reference_time = engine_time = float('inf')
+    disagreements = {}
+    for _ in range(repeat):
+        start = time.perf_counter()
+        expected = reference_score(inputs)
+        reference_time = min(reference_time, time.perf_counter() - start)
+        start = time.perf_counter()
+        try:
+            actual = score(inputs)
+        except Exception as error:
+            return [(f"<{name} raised {error!r}>", None, None)], float('nan')
+        engine_time = min(engine_time, time.perf_counter() - start)
+        for index, (want, got) in enumerate(zip(expected, actual)):
+            if bool(got) != bool(want):
+                disagreements.setdefault(index, (inputs[index], want, got))
+    return list(disagreements.values()), reference_time / engine_time if engine_time else float('inf')
+
+
+def run_differential(num_tokens: int = 2000, seed: int = 0, configs=None, verbose: bool = True):
+    """Compare all engines to the reference.
+
+    Returns:
+    - {config: {engine: (disagreements, relative speed)}}
+    """
+    tokens = make_tokens(num_tokens, seed)
+    documents = make_documents(tokens, seed)
+    results = {}
+    for config_name in configs or CONFIGS:
+        config = CONFIGS[config_name]
+        reference = ReferenceDetector(**config)
+        detector = RandomStringDetector(**config)
+        reference_tokens = lambda tokens: [reference.is_random_word(t) for t in tokens]
+        results[config_name] = {}
+        for name, make in ENGINES.items():
+            score = make(detector)
+            try:
+                results[config_name][name] = _compare(name, reference_tokens, score, tokens)
+            finally:
+                getattr(score, 'close', lambda: None)()
+        for name, make in DOCUMENT_ENGINES.items():
+            results[config_name][name] = _compare(
+                name, lambda documents: [reference(d) for d in documents], make(detector), documents)
+
+    # The sequential-run checks against the reference loop
+    results['sequential_run'] = {
+        'has_sequential_run': _compare(
+            'has_sequential_run', lambda ts: [_reference_sequential_run(t) for t in ts],
+            lambda ts: [has_sequential_run(t) for t in ts], tokens),
+    }
+    if HAS_NUMPY:
+        results['sequential_run']['has_sequential_run_batch'] = _compare(
+            'has_sequential_run_batch', lambda ts: [_reference_sequential_run(t) for t in ts],
+            lambda ts: list(has_sequential_run_batch(*encode_words(ts))), tokens)
+
+    if verbose:
+        _report(results, len(tokens), len(documents))
+    return results
+
+
+def _report(results, num_tokens, num_documents):
+    print("DIFFERENTIAL FUZZ HARNESS")
+    print("=" * 66)
+    print(f"{num_tokens} tokens ({', '.join(GENERATORS)}), {num_documents} documents")
+    print(f"{'config':<18}{'engine':<26}{'disagreements':>14}{'speed':>8}")
+    print("-" * 66)
+    for config_name, engines in results.items():
+        for name, (disagreements, speed) in engines.items():
+            print(f"{config_name:<18}{name:<26}{len(disagreements):>14}{speed:>7.2f}x")
+            for value, want, got in disagreements[:5]:
+                print(f"    {value!r}: reference {want}, engine {got}")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--tokens", type=int, default=2000, help="tokens per generator")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--config", action="append", choices=sorted(CONFIGS),
+                        help="detector settings to check (default: all)")
+    args = parser.parse_args(argv)
+    results = run_differential(args.tokens, args.seed, args.config)
+    failures = sum(len(disagreements) for engines in results.values()
+                   for disagreements, _ in engines.values())
+    print(f"\n{failures} disagreement(s)")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Load test for the HTTP detection service on localhost.
+
+Starts `python -m random_string_detector.server` in a subprocess (unless --port
+points at a running server), then drives /detect from concurrent keep-alive
+connections and reports throughput, client-side latency percentiles and the
+batching achieved by the server.
+
+Usage: python -m benchmarks.http_load [--connections N] [--duration S] [--port P]
+"""
+
+import argparse
+import asyncio
+import json
+import socket
+import subprocess
+import sys
+import time
+
+from benchmarks.common import make_documents
+
+
+async def _request(reader, writer, method: str, path: str, payload=None):
+    """Send one request on a kept-alive connection and read the JSON response."""
+    body = json.dumps(payload).encode() if payload is not None else b''
+    writer.write(f"{method} {path} HTTP/1.1\r\nHost: localhost\r\n"
+                 f"Content-Length: {len(body)}\r\n\r\n".encode() + body)
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b''):
+            break
+        name, _, value = line.decode().partition(':')
+        if name.lower() == 'content-length':
+            length = int(value)
+    return status, json.loads(await reader.readexactly(length))
+
+
+async def _client(port: int, texts, deadline: float, latencies):
+    """Send requests on one connection until the deadline."""
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    i = 0
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        status, _ = await _request(reader, writer, 'POST', '/detect', {'text': texts[i % len(texts)]})
+        latencies.append(time.perf_counter() - start)
+        assert status == 200, status
+        i += 1
+    writer.close()
+
+
+async def _run(port: int, connections: int, duration: float):
+    texts = make_documents(1000)
+    latencies = []
+    deadline = time.perf_counter() + duration
+    await asyncio.gather(*(_client(port, texts[c::connections] or texts, deadline, latencies)
+                           for c in range(connections)))
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    _, stats = await _request(reader, writer, 'GET', '/stats')
+    writer.close()
+    return latencies, stats
+
+
+def _percentile(values, q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def _start_server(args):
+    """Start the server in a subprocess on a free port and wait until it answers."""
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        port = sock.getsockname()[1]
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'random_string_detector.server', '--port', str(port),
+         '--max-delay', str(args.max_delay)],
+        stdout=subprocess.DEVNULL)
+    for _ in range(100):
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=0.1).close()
+            return process, port
+        except OSError:
+            time.sleep(0.05)
+    process.kill()
+    raise RuntimeError("server did not start")
+
+
+def run_benchmark(args):
+    process = None
+    port = args.port
+    if port is None:
+        process, port = _start_server(args)
+    try:
+        latencies, stats = asyncio.run(_run(port, args.connections, args.duration))
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+
+    print("HTTP LOAD TEST")
+    print("=" * 50)
+    print(f"connections: {args.connections}, duration: {args.duration}s")
+    print(f"requests:    {len(latencies)} ({len(latencies) / args.duration:.0f} req/s)")
+    for q in (0.5, 0.9, 0.99):
+        print(f"p{q * 100:g} latency: {1000 * _percentile(latencies, q):.2f} ms")
+    print(f"server batches: {stats['batches']}, mean batch size: {stats['mean_batch_size']:.1f}")
+    return latencies, stats
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--connections", type=int, default=32, help="concurrent keep-alive connections")
+    parser.add_argument("--duration", type=float, default=5.0, help="seconds of load")
+    parser.add_argument("--port", type=int, default=None, help="port of a running server")
+    parser.add_argument("--max-delay", type=float, default=0.002, help="batching delay of the started server")
+    run_benchmark(parser.parse_args())
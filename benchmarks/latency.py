@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Single-call latency percentiles of RandomStringDetector.__call__ for online use.
+
+Each request-sized text (1 to 6 tokens of one input class) is scored with one
+__call__ in a tight loop, and p50/p90/p99/p99.9 latencies are reported per
+input class for:
+- cold: the first call for every text, on a detector whose verdict cache
+  starts empty (words are written to the cache on their first occurrence, so
+  classes with a small vocabulary warm up quickly, as they do in a service)
+- warm: repeated calls for the same texts, answered from the verdict cache
+- uncached: repeated calls on a detector without a verdict cache
+
+Garbage collection stays enabled, as in a service, so its pauses show in the tail.
+
+Usage: python -m benchmarks.latency [--calls N]
+"""
+
+import argparse
+import random
+import time
+
+from random_string_detector import RandomStringDetector
+from random_string_detector.shared import SharedVerdictCache
+from benchmarks.common import INPUT_CLASSES
+
+PERCENTILES = (50, 90, 99, 99.9)
+
+
+def make_requests(input_class: str, n: int, seed: int = 0):
+    """Generate n request-sized texts of 1 to 6 tokens of one input class."""
+    rng = random.Random(seed)
+    generate = INPUT_CLASSES[input_class]
+    return [' '.join(generate(rng) for _ in range(rng.randint(1, 6))) for _ in range(n)]
+
+
+def percentiles(samples, points=PERCENTILES):
+    """Get the nearest-rank percentiles of samples."""
+    ordered = sorted(samples)
+    return {point: ordered[min(len(ordered) - 1, max(0, int(-(-point * len(ordered) // 100)) - 1))]
+            for point in points}
+
+
+def _latencies(detector, texts):
+    """Time one __call__ per text, in nanoseconds."""
+    perf_counter_ns = time.perf_counter_ns
+    samples = [0] * len(texts)
+    for index, text in enumerate(texts):
+        start = perf_counter_ns()
+        detector(text)
+        samples[index] = perf_counter_ns() - start
+    return samples
+
+
+def run_benchmark(calls: int = 20000, seed: int = 0):
+    detector = RandomStringDetector(allow_numbers=True)
+    # Time of an empty measurement, to tell the timer's own cost apart
+    overhead = percentiles(_latencies(lambda text: None, [''] * 10000))[50]
+
+    print("LATENCY BENCHMARK")
+    print("=" * 74)
+    print(f"{calls} calls per cell, timer overhead ~{overhead / 1000:.2f}us (not subtracted)")
+    print(f"{'input class':<16}{'mode':<10}" + ''.join(f"{f'p{p}':>12}" for p in PERCENTILES))
+    results = {}
+    for input_class in INPUT_CLASSES:
+        print("-" * 74)
+        texts = make_requests(input_class, calls, seed)
+        with SharedVerdictCache.create(detector.fingerprint, slots=1 << 20) as cache:
+            cached = detector.replace(cache=cache)
+            cold = _latencies(cached, texts)
+            warm = _latencies(cached, texts)
+        uncached = _latencies(detector, texts)
+        results[input_class] = {}
+        for mode, samples in (('cold', cold), ('warm', warm), ('uncached', uncached)):
+            results[input_class][mode] = percentiles(samples)
+            print(f"{input_class:<16}{mode:<10}"
+                  + ''.join(f"{results[input_class][mode][p] / 1000:>10.1f}us" for p in PERCENTILES))
+
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--calls", type=int, default=20000, help="texts (calls) per input class and mode")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    run_benchmark(args.calls, args.seed)
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Worst-case input latency, with and without the input-size guards.
+
+Scores pathological inputs (megabyte-long words of letters, digits and
+mixed alphanumerics, and documents with up to a million tokens) with an
+unguarded detector and with one limited by max_token_length, max_tokens and
+time_budget, and reports the time of each call. With the guards the worst
+case is bounded by the limits, whatever the input.
+
+Usage: python -m benchmarks.pathological [--size N] [--skip-unguarded]
+"""
+
+import argparse
+import random
+import string
+import time
+
+from random_string_detector import RandomStringDetector
+
+GUARDS = {'max_token_length': 256, 'max_tokens': 10000, 'time_budget': 0.05}
+
+
+def make_inputs(size: int, seed: int = 0):
+    """Build the pathological inputs, `size` characters or tokens each."""
+    rng = random.Random(seed)
+    half = size // 2
+    return {
+        'long word (letters)': ''.join(rng.choice(string.ascii_lowercase) for _ in range(size)),
+        'long word (repeated)': 'ab' * half,
+        'long word (digits, letters)': '1' * half + 'z' * half,
+        'long word (hex)': '%0*x' % (size, rng.getrandbits(4 * size)),
+        'many short tokens': ' '.join(rng.choice(('the', 'of', 'and', 'a', 'to')) for _ in range(size)),
+        'many word tokens': ' '.join(rng.choice(('hello', 'world', 'xkqzvw', 'user123'))
+                                     for _ in range(size // 4)),
+    }
+
+
+def _time(detector, text):
+    start = time.perf_counter()
+    detector(text)
+    return time.perf_counter() - start
+
+
+def run_benchmark(size: int = 1 << 20, unguarded: bool = True):
+    inputs = make_inputs(size)
+    detectors = {}
+    if unguarded:
+        detectors['unguarded'] = RandomStringDetector(allow_numbers=True)
+    detectors['guarded'] = RandomStringDetector(allow_numbers=True, **GUARDS)
+
+    print("PATHOLOGICAL INPUT BENCHMARK")
+    print("=" * 64)
+    print(f"allow_numbers=True, guards: {', '.join(f'{k}={v}' for k, v in GUARDS.items())}")
+    print(f"{'input':<30}" + ''.join(f"{name:>16}" for name in detectors))
+    print("-" * 64)
+    results = {}
+    for name, text in inputs.items():
+        results[name] = {mode: _time(detector, text) for mode, detector in detectors.items()}
+        print(f"{name:<30}" + ''.join(f"{results[name][mode] * 1000:>14.1f}ms" for mode in detectors))
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--size", type=int, default=1 << 20, help="characters or tokens per input")
+    parser.add_argument("--skip-unguarded", action="store_true", help="only time the guarded detector")
+    args = parser.parse_args()
+    run_benchmark(args.size, not args.skip_unguarded)
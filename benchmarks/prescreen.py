@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Long-token pre-screen: how many tokens each stage decides, and the speedup.
+
+Scores long tokens of several classes (hex digests, UUIDs, base64 and API
+keys, long words) with detector.is_random_word alone and with
+vectorized.screen_words, which decides the clear-cut long tokens from their
+character counts in one NumPy batch and sends the rest to is_random_word.
+Reports the tokens decided by the screen and by the full check, and the time
+of both, per input class. Needs NumPy.
+
+Usage: python -m benchmarks.prescreen [--tokens N] [--min-length N]
+"""
+
+import argparse
+import base64
+import random
+import string
+import time
+
+from random_string_detector import RandomStringDetector
+from random_string_detector.vectorized import screen_words
+from benchmarks.common import NATURAL_WORDS, long_hash, uuid_string
+
+
+def base64_key(rng: random.Random) -> str:
+    """A base64 encoded random key."""
+    return base64.b64encode(rng.randbytes(rng.choice((18, 24, 33)))).decode().rstrip('=')
+
+
+def api_key(rng: random.Random) -> str:
+    """A prefixed alphanumeric API key."""
+    return 'sk_live_' + ''.join(rng.choice(string.ascii_letters + string.digits) for _ in range(32))
+
+
+def long_word(rng: random.Random) -> str:
+    """Natural words run together, sometimes with a number suffix."""
+    word = ''.join(rng.choice(NATURAL_WORDS) for _ in range(3))
+    return word + str(rng.randint(1, 2024)) if rng.random() < 0.5 else word
+
+
+LONG_CLASSES = {
+    'hex_hash': long_hash,
+    'uuid': uuid_string,
+    'base64': base64_key,
+    'api_key': api_key,
+    'long_word': long_word,
+}
+
+
+def _best(function, repeat: int = 3):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def run_benchmark(num_tokens: int = 20000, min_length: int = 16, seed: int = 0):
+    print("PRE-SCREEN BENCHMARK")
+    print("=" * 84)
+    print(f"{num_tokens} tokens per class, min_length={min_length}")
+    print(f"{'detector':<15}{'input class':<12}{'screen: random':>16}{'not random':>12}{'full':>8}"
+          f"{'full only':>11}{'screened':>11}{'speedup':>9}")
+    results = {}
+    for name, settings in (('default', {}), ('allow_numbers', {'allow_numbers': True})):
+        detector = RandomStringDetector(**settings)
+        print("-" * 84)
+        for input_class, generate in LONG_CLASSES.items():
+            rng = random.Random(seed)
+            tokens = [generate(rng) for _ in range(num_tokens)]
+            full_time, expected = _best(lambda: [detector.is_random_word(t) for t in tokens])
+            screen_time, (verdicts, stats) = _best(lambda: screen_words(detector, tokens, min_length))
+            assert verdicts == expected, "the pre-screen changed a verdict"
+            results[(name, input_class)] = dict(stats, full_time=full_time, screen_time=screen_time)
+            print(f"{name:<15}{input_class:<12}{stats['screened_random']:>16}{stats['screened_not_random']:>12}"
+                  f"{stats['full']:>8}{full_time * 1000:>9.1f}ms{screen_time * 1000:>9.1f}ms"
+                  f"{full_time / screen_time:>8.2f}x")
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--tokens", type=int, default=20000, help="tokens per input class")
+    parser.add_argument("--min-length", type=int, default=16, help="minimum length of the screened tokens")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    run_benchmark(args.tokens, args.min_length, args.seed)
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Performance regression gate: compare the detector and preprocessing paths to a stored baseline.
+
+Every benchmark is run several times and summarized by its median and median
+absolute deviation (MAD). A benchmark regresses when its median is slower than
+the baseline median by more than the tolerance AND by more than `--mad-factor`
+times the combined MAD, so that noisy benchmarks need a larger slowdown to fail.
+
+Timings are normalized by a fixed pure-Python calibration loop measured in the
+same run, so a baseline committed from one machine can be checked on another.
+
+Usage:
+    python -m benchmarks.regression            # compare, exit 1 on a regression
+    python -m benchmarks.regression --update   # rewrite benchmarks/baseline.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+
+from random_string_detector import RandomStringDetector
+from random_string_detector.preprocessing import TextPreprocessing
+from benchmarks.common import INPUT_CLASSES, make_documents, make_words
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+
+
+def _calibrate():
+    """Fixed pure-Python workload, the unit that timings are normalized by."""
+    total = 0
+    for i in range(20000):
+        total += len(str(i)) * (i & 7)
+    return total
+
+
+def _word_benchmark(input_class, allow_numbers):
+    detector = RandomStringDetector(allow_numbers=allow_numbers)
+    words = make_words(input_class, 300)
+    is_random_word = detector.is_random_word
+    return (lambda: [is_random_word(w) for w in words]), len(words)
+
+
+def _document_benchmark():
+    detector = RandomStringDetector(allow_numbers=True)
+    documents = make_documents(200)
+    return (lambda: [detector(d) for d in documents]), len(documents)
+
+
+def _preprocessing_benchmark():
+    preprocessing = TextPreprocessing(stopwords=['the', 'over', 'a', 'of'])
+    documents = make_documents(200)
+    return (lambda: [preprocessing(d) for d in documents]), len(documents)
+
+
+def _pipeline_benchmark():
+    detector = RandomStringDetector()
+    preprocessing = TextPreprocessing()
+    documents = make_documents(200)
+    return (lambda: [detector(preprocessing(d)) for d in documents]), len(documents)
+
+
+# Benchmark name -> setup returning (function, operations per call)
+BENCHMARKS = {
+    **{f'is_random_word/{input_class}': (
+        lambda input_class=input_class: _word_benchmark(input_class, input_class != 'alphabetic'))
+       for input_class in INPUT_CLASSES},
+    'detector/documents': _document_benchmark,
+    'preprocessing/documents': _preprocessing_benchmark,
+    'pipeline/documents': _pipeline_benchmark,
+}
+
+
+def _time(function, min_seconds: float = 0.05) -> float:
+    """Time function, calling it enough times to run for at least min_seconds."""
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            function()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_seconds:
+            return elapsed / loops
+        loops *= 2
+
+
+def _summarize(samples):
+    median = statistics.median(samples)
+    return {'median': median, 'mad': statistics.median(abs(s - median) for s in samples)}
+
+
+def measure(repeats: int = 9, names=None):
+    """Run the benchmarks, interleaved so that machine load drifts hit all of them.
+
+    Returns:
+    - {name: {"median", "mad", "ops_per_second"}}, median and MAD being in
+      calibration loops per 1000 operations
+    """
+    names = list(names or BENCHMARKS)
+    setups = {name: BENCHMARKS[name]() for name in names}
+    samples = {name: [] for name in names}
+    seconds = {name: [] for name in names}
+    for _ in range(repeats):
+        unit = _time(_calibrate)
+        for name, (function, operations) in setups.items():
+            per_operation = _time(function) / operations
+            seconds[name].append(per_operation)
+            samples[name].append(1000 * per_operation / unit)
+    results = {}
+    for name, values in samples.items():
+        results[name] = _summarize(values)
+        results[name]['ops_per_second'] = 1 / statistics.median(seconds[name])
+    return results
+
+
+def compare(baseline, current, tolerance: float = 0.25, mad_factor: float = 3.0):
+    """Compare current results to the baseline.
+
+    Returns:
+    - list of (name, relative delta or None, status), status being "ok",
+      "faster", "regression" or "new"
+    """
+    rows = []
+    for name, result in current.items():
+        reference = baseline.get(name)
+        if reference is None:
+            rows.append((name, None, 'new'))
+            continue
+        delta = result['median'] / reference['median'] - 1
+        noise = mad_factor * (result['mad'] + reference['mad'])
+        difference = result['median'] - reference['median']
+        if delta > tolerance and difference > noise:
+            status = 'regression'
+        elif delta < -tolerance and -difference > noise:
+            status = 'faster'
+        else:
+            status = 'ok'
+        rows.append((name, delta, status))
+    return rows
+
+
+def run_benchmark(baseline_path: str = BASELINE_PATH, update: bool = False, repeats: int = 9,
+                  tolerance: float = 0.25, mad_factor: float = 3.0) -> int:
+    print("REGRESSION BENCHMARK")
+    print("=" * 80)
+    current = measure(repeats)
+
+    if update:
+        with open(baseline_path, 'w') as f:
+            json.dump({
+                'python': platform.python_version(),
+                'unit': 'calibration loops per 1000 operations',
+                'results': current,
+            }, f, indent=2, sort_keys=True)
+            f.write('\n')
+        for name, result in current.items():
+            print(f"{name:<32}{result['median']:>10.3f} +/- {result['mad']:<8.3f}"
+                  f"{result['ops_per_second']:>12.0f} ops/s")
+        print(f"Baseline written to {baseline_path}")
+        return 0
+
+    with open(baseline_path) as f:
+        baseline = json.load(f)['results']
+    print(f"{'benchmark':<32}{'baseline':>10}{'current':>10}{'delta':>9}{'ops/s':>10}  status")
+    print("-" * 80)
+    rows = compare(baseline, current, tolerance, mad_factor)
+    for name, delta, status in rows:
+        reference = baseline.get(name, {}).get('median', float('nan'))
+        delta_text = '' if delta is None else f"{delta:+.1%}"
+        print(f"{name:<32}{reference:>10.3f}{current[name]['median']:>10.3f}{delta_text:>9}"
+              f"{current[name]['ops_per_second']:>10.0f}  {status}")
+
+    regressions = [name for name, _, status in rows if status == 'regression']
+    if regressions:
+        print(f"\n{len(regressions)} regression(s): {', '.join(regressions)}")
+        return 1
+    print("\nNo significant regression")
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="baseline JSON file")
+    parser.add_argument("--update", action="store_true", help="write the current results as the baseline")
+    parser.add_argument("--repeats", type=int, default=9, help="runs per benchmark")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="relative slowdown tolerated (0.25 = 25%%)")
+    parser.add_argument("--mad-factor", type=float, default=3.0,
+                        help="slowdowns within this many MADs of noise are tolerated")
+    args = parser.parse_args()
+    sys.exit(run_benchmark(args.baseline, args.update, args.repeats, args.tolerance, args.mad_factor))
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Thread scaling benchmark for RandomStringDetector.batch().
+
+On free-threaded (no-GIL) builds throughput should grow with the number of
+threads; on regular builds it stays flat because the GIL serializes scoring.
+
+Usage: python -m benchmarks.thread_scaling [--documents N] [--max-threads N]
+"""
+
+import argparse
+import os
+import time
+
+from random_string_detector import RandomStringDetector
+from random_string_detector.parallel import gil_enabled
+from benchmarks.common import make_documents
+
+
+def run_benchmark(num_documents: int = 20000, max_threads: int = None, repeat: int = 3):
+    detector = RandomStringDetector(allow_numbers=True)
+    documents = make_documents(num_documents)
+    max_threads = max_threads or os.cpu_count() or 1
+
+    thread_counts = []
+    count = 1
+    while count < max_threads:
+        thread_counts.append(count)
+        count *= 2
+    thread_counts.append(max_threads)
+
+    print("THREAD SCALING BENCHMARK")
+    print("=" * 60)
+    print(f"GIL enabled: {gil_enabled()}, CPUs: {os.cpu_count()}, documents: {num_documents}")
+    print(f"{'threads':>8}{'docs/s':>14}{'speedup':>10}{'efficiency':>12}")
+    print("-" * 60)
+
+    expected = detector.batch(documents, max_workers=1)
+    results = {}
+    for threads in thread_counts:
+        best = float('inf')
+        for _ in range(repeat):
+            start = time.perf_counter()
+            verdicts = detector.batch(documents, max_workers=threads)
+            best = min(best, time.perf_counter() - start)
+        assert verdicts == expected, "batch results depend on the number of threads"
+        throughput = num_documents / best
+        results[threads] = throughput
+        speedup = throughput / results[1]
+        print(f"{threads:>8}{throughput:>14.0f}{speedup:>9.2f}x{speedup / threads:>11.0%}")
+
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--documents", type=int, default=20000, help="number of documents")
+    parser.add_argument("--max-threads", type=int, default=None, help="default: number of CPUs")
+    args = parser.parse_args()
+    run_benchmark(args.documents, args.max_threads)
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Benchmark of the overhead of per-decision tracing on is_random_word.
+
+Compares an untraced detector, detectors traced at several sample rates and
+the old approach of monkeypatching is_random_word with a wrapper that
+re-checks every word.
+
+Usage: python -m benchmarks.tracing [--number N] [--words N]
+"""
+
+import argparse
+import timeit
+from random_string_detector import RandomStringDetector
+from benchmarks.common import INPUT_CLASSES, make_words
+
+SAMPLE_RATES = (0.0001, 0.01, 0.1)
+
+
+def _monkeypatched(detector, callback):
+    """Wrap is_random_word the way callers did before tracing was supported."""
+    original = type(detector).is_random_word
+
+    def is_random_word(word):
+        verdict, rule, counts = detector.explain(word)
+        if verdict != original(detector, word):  # pragma: no cover - consistency check
+            raise AssertionError(word)
+        callback(word, verdict, rule, counts)
+        return verdict
+    return is_random_word
+
+
+def run_benchmark(number: int = 3, num_words: int = 2000):
+    words = [word for input_class in INPUT_CLASSES for word in make_words(input_class, num_words)]
+    traced = []
+
+    def callback(word, verdict, rule, counts):
+        traced.append(rule)
+
+    variants = {'untraced': RandomStringDetector(allow_numbers=True).is_random_word}
+    for rate in SAMPLE_RATES:
+        variants[f'rate={rate}'] = RandomStringDetector(
+            allow_numbers=True, tracer=callback, trace_sample_rate=rate).is_random_word
+    variants['monkeypatched'] = _monkeypatched(RandomStringDetector(allow_numbers=True), callback)
+
+    print("TRACING BENCHMARK")
+    print("=" * 50)
+    print(f"{'variant':<16}{'per word':>14}{'overhead':>12}")
+    print("-" * 50)
+
+    # Variants are timed in turns, so that drifting machine load hits all of them
+    best = dict.fromkeys(variants, float('inf'))
+    for _ in range(7):
+        for name, is_random_word in variants.items():
+            seconds = timeit.timeit(lambda: [is_random_word(w) for w in words], number=number)
+            best[name] = min(best[name], seconds)
+
+    results = {}
+    for name, seconds in best.items():
+        results[name] = seconds * 1e6 / (number * len(words))
+        overhead = results[name] / results['untraced'] - 1
+        print(f"{name:<16}{results[name]:>12.2f}us{overhead:>+11.1%}")
+
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--number", type=int, default=3, help="iterations per measurement")
+    parser.add_argument("--words", type=int, default=2000, help="words per input class")
+    args = parser.parse_args()
+    run_benchmark(args.number, args.words)
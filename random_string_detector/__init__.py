@@ -1,2 +1,3 @@
 """__init__.py for src package."""
-from random_string_detector.detector import RandomStringDetector
+from random_string_detector.detector import RandomStringDetector, iter_token_spans
+from random_string_detector.keyboards import KeyboardLayout, QWERTY, AZERTY, QWERTZ
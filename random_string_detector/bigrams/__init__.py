@@ -1,4 +1,30 @@
-"""Importing all bigrams from the files in this folder."""
-from random_string_detector.bigrams.english import ENGLISH
-from random_string_detector.bigrams.portuguese import PORTUGUESE_WITHOUT_ACCENTS
-from random_string_detector.bigrams.french import FRENCH_WITHOUT_ACCENTS
+"""Bigram tables of the files in this folder, each imported on first use.
+
+A process only loads the tables it uses, e.g. none in workers that score with a
+SharedBigramTable.
+"""
+import importlib
+
+# Name of each table -> module that defines it
+TABLES = {
+    'ENGLISH': 'random_string_detector.bigrams.english',
+    'PORTUGUESE_WITHOUT_ACCENTS': 'random_string_detector.bigrams.portuguese',
+    'FRENCH_WITHOUT_ACCENTS': 'random_string_detector.bigrams.french',
+}
+
+# Star-imports bind the tables too, loading them through __getattr__
+__all__ = ['TABLES', *TABLES]
+
+
+def __getattr__(name):
+    try:
+        module = TABLES[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    table = getattr(importlib.import_module(module), name)
+    globals()[name] = table
+    return table
+
+
+def __dir__():
+    return sorted(set(globals()) | set(TABLES))
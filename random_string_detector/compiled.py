@@ -0,0 +1,113 @@
+"""Bigram tables compiled once and shared by every detector that uses them.
+
+A CompiledTable ranks the bigrams of a table by probability. Whether a bigram
+is common for a given common_bigrams_threshold is then a comparison of its
+rank with a cutoff found by bisection, so a detector only keeps two integers
+of its own, and any number of detectors with different thresholds share one
+compiled table (a flyweight).
+
+Tables are registered by identity: the bundled tables, SharedBigramTable and
+any other read-only mapping passed to several detectors are compiled once.
+Plain dicts are copied by each detector, so each copy is compiled on its own;
+wrap a custom table in a MappingProxyType once to share it.
+"""
+import bisect
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Mapping, Tuple
+
+# Compiled tables, by id of the table, which they keep alive
+_REGISTRY = OrderedDict()
+_MAX_TABLES = 64
+_LOCK = threading.Lock()
+
+
+def rank_bigrams(table: Mapping[str, float]) -> Tuple[Dict[str, int], List[float]]:
+    """Rank the bigrams of a table by ascending probability.
+
+    Args:
+    - table: bigram table
+
+    Returns:
+    - (ranks, probs): the rank of each bigram, -1 for bigrams with a NaN probability
+      (which is never above any threshold), and the probabilities indexed by rank
+    """
+    ranked = sorted((prob, bigram) for bigram, prob in table.items() if prob == prob)
+    ranks = {bigram: rank for rank, (_, bigram) in enumerate(ranked)}
+    for bigram, prob in table.items():
+        if prob != prob:
+            ranks[bigram] = -1
+    return ranks, [prob for prob, _ in ranked]
+
+
+class CompiledTable(object):
+    """Bigram table ranked by probability, for threshold checks by rank."""
+
+    __slots__ = ('table', 'ranks', 'probs', '_cutoffs')
+
+    def __init__(self, table: Mapping[str, float]):
+        """Initialize a CompiledTable object.
+
+        Attributes:
+        - table (Mapping): the bigram table.
+        - ranks (dict): rank of each bigram, see rank_bigrams().
+        - probs (list): probabilities in ascending order, indexed by rank.
+        """
+        self.table = table
+        self.ranks, self.probs = rank_bigrams(table)
+        self._cutoffs = {}
+
+    def view(self, common_bigrams_threshold: float) -> Tuple[int, int]:
+        """Get the per-threshold view of the table: (cutoff, rank of missing bigrams).
+
+        A bigram is common if `ranks.get(bigram, missing_rank) >= cutoff`: bigrams of
+        the table are common if their probability is above the threshold, and
+        bigrams missing from the table (probability 0) only if the threshold is negative.
+        """
+        try:
+            return self._cutoffs[common_bigrams_threshold]
+        except (KeyError, TypeError):
+            pass
+        cutoff = bisect.bisect_right(self.probs, common_bigrams_threshold)
+        missing_rank = len(self.probs) if 0 > common_bigrams_threshold else -1
+        view = (cutoff, missing_rank)
+        if len(self._cutoffs) < 1024:
+            self._cutoffs[common_bigrams_threshold] = view
+        return view
+
+    def __repr__(self):
+        return f"CompiledTable({len(self.ranks)} bigrams)"
+
+
+def compile_table(table: Mapping[str, float]) -> CompiledTable:
+    """Get the compiled form of a bigram table, compiling it on first use.
+
+    Args:
+    - table: bigram table
+
+    Returns:
+    - the CompiledTable shared by all callers passing the same table object
+    """
+    key = id(table)
+    with _LOCK:
+        compiled = _REGISTRY.get(key)
+        if compiled is not None and compiled.table is table:
+            _REGISTRY.move_to_end(key)
+            return compiled
+    compiled = CompiledTable(table)
+    with _LOCK:
+        # Another thread may have compiled the same table meanwhile
+        existing = _REGISTRY.get(key)
+        if existing is not None and existing.table is table:
+            return existing
+        _REGISTRY[key] = compiled
+        while len(_REGISTRY) > _MAX_TABLES:
+            _REGISTRY.popitem(last=False)
+    return compiled
+
+
+def registry_stats() -> Dict[str, int]:
+    """Get the number of compiled tables and of bigrams they hold."""
+    with _LOCK:
+        return {'tables': len(_REGISTRY),
+                'bigrams': sum(len(compiled.ranks) for compiled in _REGISTRY.values())}
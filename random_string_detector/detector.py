@@ -1,7 +1,15 @@
 """Random String Detector."""
+import hashlib
+import itertools
+import math
+import random
+import re
+import time
 from types import MappingProxyType
-from typing import Dict, Union
-from random_string_detector.bigrams import ENGLISH
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+from random_string_detector.compiled import compile_table
+from random_string_detector import bigrams as bundled_bigrams
+from random_string_detector.keyboards import KeyboardLayout
 
 # Common keyboard patterns
 KEYBOARD_PATTERNS = [
@@ -25,6 +33,26 @@ KEYBOARD_PATTERNS = [
     "abcdef", "fedcba",
 ]
 
+# Whitespace-separated tokens, matching the splitting done by str.split()
+TOKEN_PATTERN = re.compile(r'\S+')
+
+# Number of tokens scored between two checks of the time budget
+TIME_CHECK_INTERVAL = 16
+
+
+def iter_token_spans(text: str) -> Iterator[Tuple[int, int]]:
+    """Lazily yield the (start, end) character offsets of the tokens in text.
+
+    Args:
+    - text: input text
+
+    Returns:
+    - iterator of (start, end) spans, such that text[start:end] is a token
+    """
+    for match in TOKEN_PATTERN.finditer(text):
+        yield match.span()
+
+
 def is_keyboard_pattern(text):
     """Check if text matches common keyboard patterns"""
     text_lower = text.lower()
@@ -38,75 +66,375 @@ def is_keyboard_pattern(text):
         if len(text_lower) >= 4 and text_lower in pattern:
             return True
     
-    # Check for sequential characters (easy to type)
-    if len(text_lower) >= 4:
-        # Check for sequential letters
-        for i in range(len(text_lower) - 3):
-            if (ord(text_lower[i+1]) - ord(text_lower[i]) == 1 and
-                ord(text_lower[i+2]) - ord(text_lower[i+1]) == 1 and
-                ord(text_lower[i+3]) - ord(text_lower[i+2]) == 1):
-                return True
-        
-        # Check for sequential numbers
-        if text_lower.isdigit():
-            for i in range(len(text_lower) - 3):
-                if (int(text_lower[i+1]) - int(text_lower[i]) == 1 and
-                    int(text_lower[i+2]) - int(text_lower[i+1]) == 1 and
-                    int(text_lower[i+3]) - int(text_lower[i+2]) == 1):
-                    return True
+    # Check for sequential characters (easy to type), e.g. "abcd" or "1234"
+    if has_sequential_run(text_lower):
+        return True
     
     return False
 
 
+def has_sequential_run(text: str, min_length: int = 4, reverse: bool = False) -> bool:
+    """Check if text contains a run of consecutive code points, e.g. "abcd" or "1234".
+
+    The code points are scanned once, counting consecutive steps of +1 (or -1
+    with reverse) until min_length - 1 of them follow each other.
+
+    Args:
+    - text: string to check
+    - min_length: minimum number of characters in the run
+    - reverse: whether descending runs such as "fedcba" also count
+
+    Returns:
+    - True if text contains a sequential run, False otherwise
+    """
+    steps = min_length - 1
+    run = 0
+    step = 0
+    # Code points are >= 0, so the first character never continues a run
+    previous = -2
+    for code in map(ord, text):
+        diff = code - previous
+        previous = code
+        if diff == 1 or (reverse and diff == -1):
+            run = run + 1 if diff == step else 1
+            if run >= steps:
+                return True
+            step = diff
+        else:
+            run = 0
+            step = 0
+    return False
+
+
+# Rules that decide is_random_word, in the order they are checked
+RULES = (
+    'too_long', 'too_short', 'not_alphabetic', 'digits_only', 'repeated_character', 'keyboard_pattern',
+    'keyboard_walk', 'uncommon_bigrams', 'duplicated_bigrams', 'common_bigrams',
+)
+# Decisions as (verdict, rule), allocated once
+_TOO_LONG = (True, 'too_long')
+_TOO_SHORT = (False, 'too_short')
+_NOT_ALPHABETIC = (False, 'not_alphabetic')
+_DIGITS_ONLY = (True, 'digits_only')
+_REPEATED_CHARACTER = (True, 'repeated_character')
+_KEYBOARD_PATTERN = (True, 'keyboard_pattern')
+_KEYBOARD_WALK = (True, 'keyboard_walk')
+_UNCOMMON_BIGRAMS = (True, 'uncommon_bigrams')
+_DUPLICATED_BIGRAMS = (True, 'duplicated_bigrams')
+_COMMON_BIGRAMS = (False, 'common_bigrams')
+_BIGRAM_RULES = frozenset(('uncommon_bigrams', 'duplicated_bigrams', 'common_bigrams'))
+
+
+class _Tracer(object):
+    """Callback of a traced detector, and the sampling of the calls passed to it."""
+
+    __slots__ = ('callback', 'sample_rate')
+
+    def __init__(self, callback, sample_rate: float):
+        if not 0 < sample_rate <= 1:
+            raise ValueError("trace_sample_rate must be in (0, 1]")
+        self.callback = callback
+        self.sample_rate = sample_rate
+
+    def next_countdown(self) -> int:
+        """Draw the number of calls until the next sampled one.
+
+        Gaps follow a geometric distribution, so every call is sampled with
+        probability sample_rate without drawing a random number per call, and
+        periodic inputs cannot line up with the samples.
+        """
+        if self.sample_rate == 1:
+            return 1
+        return int(math.log(1.0 - random.random()) / math.log(1.0 - self.sample_rate)) + 1
+
+    def wrap(self, decide, explain):
+        """Build the is_random_word of a traced detector.
+
+        Args:
+        - decide: function of a word returning a tuple whose first item is the verdict
+        - explain: the detector's explain(), called for the sampled calls
+
+        Returns:
+        - function of a word returning its verdict. Unsampled calls only advance a
+          countdown before calling decide, so they are as deep as untraced calls
+        """
+        callback = self.callback
+        next_countdown = self.next_countdown
+        advance = next
+        # The countdown is an iterator of the unsampled calls before the next sampled
+        # one: advancing it costs less than decrementing an int, which allocates
+        ticks = itertools.repeat(None, next_countdown() - 1)
+
+        def is_random_word(word: str):
+            nonlocal ticks
+            if advance(ticks, True) is None:
+                return decide(word)[0]
+            # Races between threads only shift which call gets sampled
+            ticks = itertools.repeat(None, next_countdown() - 1)
+            verdict, rule, counts = explain(word)
+            callback(word, verdict, rule, counts)
+            return verdict
+        return is_random_word
+
+
+class _WordFeatures(object):
+    """Word-level features shared by all digit-containing bigrams of a word."""
+
+    __slots__ = ('length', 'letter_count', 'digit_count', 'cluster_count',
+                 'alternating', 'hex_like')
+
+    def __init__(self, word: str, alternating: bool, hex_like: bool):
+        """Scan the word once for letter/digit counts and clusters.
+
+        Attributes:
+        - length (int): length of the word.
+        - letter_count (int): number of alphabetic characters.
+        - digit_count (int): number of digit characters.
+        - cluster_count (int): number of alternating digit/non-digit runs.
+        - alternating (bool): whether the word has an alternating letter-digit pattern.
+        - hex_like (bool): whether the word looks like a hexadecimal string.
+        """
+        letter_count = 0
+        digit_count = 0
+        cluster_count = 0
+        previous_is_digit = None
+        for char in word:
+            is_digit = char.isdigit()
+            if is_digit:
+                digit_count += 1
+            elif char.isalpha():
+                letter_count += 1
+            if is_digit is not previous_is_digit:
+                cluster_count += 1
+                previous_is_digit = is_digit
+        self.length = len(word)
+        self.letter_count = letter_count
+        self.digit_count = digit_count
+        self.cluster_count = cluster_count
+        self.alternating = alternating
+        self.hex_like = hex_like
+
+
 class RandomStringDetector(object):
     """Class to detect random typing in a given text."""
 
     def __init__(
             self,
-            bigrams_probs: Union[MappingProxyType[str,
-                                                  float], Dict[str, float]] = ENGLISH,
+            bigrams_probs: Optional[Union[MappingProxyType[str,
+                                                           float], Dict[str, float]]] = None,
             common_bigrams_threshold: float = 0.1,
             uncommon_bigrams_threshold: float = 0.005,
             duplicated_bigrams_threshold: float = 0.33,
-            allow_numbers: bool = False):
+            allow_numbers: bool = False,
+            keyboard_layout: Optional[KeyboardLayout] = None,
+            max_token_length: Optional[int] = None,
+            max_tokens: Optional[int] = None,
+            time_budget: Optional[float] = None,
+            cache=None,
+            metrics=None,
+            tracer=None,
+            trace_sample_rate: float = 0.01):
         """Initialize a RandomStringDetector object.
 
         Attributes:
-        - bigrams_probs (dict): dictionary with bigrams and their probabilities.
+        - bigrams_probs (dict): dictionary with bigrams and their probabilities (ENGLISH if None).
         - common_bigrams_threshold (float): threshold to determine if a bigram is common or not.
         - uncommon_bigrams_threshold (float): threshold to determine if a word is random typing or not.
         - duplicated_bigrams_threshold (float): threshold to determine if a word is random typing or not.
         - allow_numbers (bool): whether to allow numbers in the string
+        - keyboard_layout (KeyboardLayout): layout used to detect keyboard walks, e.g.
+          AZERTY to go with FRENCH_WITHOUT_ACCENTS (no walk detection if None)
+        - max_token_length (int): tokens longer than this are random typing without
+          being scored (no limit if None)
+        - max_tokens (int): at most this many tokens of a text are scored; the verdict
+          is taken on them (no limit if None)
+        - time_budget (float): seconds after which __call__ stops scoring a text and
+          takes the verdict on the tokens scored so far; checked every few tokens,
+          so combine it with max_token_length to bound the time of a single token
+        - cache: verdict cache for is_random_word, e.g. a SharedVerdictCache. It must
+          have a `fingerprint` equal to the detector's, and `get(word)` / `set(word,
+          verdict)` methods, where get returns None for words not in the cache.
+        - metrics (DetectorMetrics): metrics updated by every call, see
+          random_string_detector.metrics. Metrics stay in the process that created
+          them, so they are not pickled (None in process pool workers).
+        - tracer (callable): called as `tracer(word, verdict, deciding_rule, counts)`
+          for a sample of is_random_word calls, see explain(). Not pickled either.
+        - trace_sample_rate (float): fraction of is_random_word calls passed to the tracer.
         """
-        self.bigrams = bigrams_probs
-        self.common_bigrams_threshold = common_bigrams_threshold
-        self.uncommon_bigrams_threshold = uncommon_bigrams_threshold
-        self.duplicated_bigrams_threshold = duplicated_bigrams_threshold
-        self.allow_numbers = allow_numbers
+        if bigrams_probs is None:
+            bigrams_probs = bundled_bigrams.ENGLISH
+        # Plain dicts are snapshotted so that later changes by the caller cannot
+        # leak into a detector that may be shared between threads
+        if isinstance(bigrams_probs, dict):
+            bigrams_probs = MappingProxyType(dict(bigrams_probs))
 
-    def _is_likely_random_alphanumeric_bigram(self, bigram: str, full_word: str) -> bool:
+        _set = object.__setattr__
+        _set(self, 'bigrams', bigrams_probs)
+        _set(self, 'common_bigrams_threshold', common_bigrams_threshold)
+        _set(self, 'uncommon_bigrams_threshold', uncommon_bigrams_threshold)
+        _set(self, 'duplicated_bigrams_threshold', duplicated_bigrams_threshold)
+        _set(self, 'allow_numbers', allow_numbers)
+        _set(self, 'keyboard_layout', keyboard_layout)
+        _set(self, 'max_token_length', max_token_length)
+        _set(self, 'max_tokens', max_tokens)
+        _set(self, 'time_budget', time_budget)
+        _set(self, 'cache', cache)
+        _set(self, 'metrics', metrics)
+        _set(self, '_fingerprint', None)
+
+        # Compiled state, shared by all detectors on the same table: bigrams ranked
+        # by probability. A bigram is common if its rank reaches the cutoff of the
+        # threshold; bigrams missing from the table have probability 0, so they
+        # only count as common if the threshold is negative.
+        compiled = compile_table(bigrams_probs)
+        _set(self, '_compiled', compiled)
+        _set(self, '_bigram_ranks', compiled.ranks)
+        cutoff, missing_rank = compiled.view(common_bigrams_threshold)
+        _set(self, '_common_cutoff', cutoff)
+        _set(self, '_missing_rank', missing_rank)
+
+        if cache is not None:
+            if cache.fingerprint != self.fingerprint:
+                raise ValueError("the cache was created for a different detector configuration")
+            # Only detectors with a cache pay for the lookups
+            _set(self, 'is_random_word', self._cached_is_random_word)
+            if metrics is not None and hasattr(cache, 'stats'):
+                metrics.track_cache(cache)
+
+        _set(self, 'tracer', tracer)
+        _set(self, 'trace_sample_rate', trace_sample_rate)
+        if tracer is not None:
+            # Likewise, only traced detectors pay for the sampling, and without a
+            # cache their unsampled calls go straight to _decide
+            if cache is None:
+                decide = self._decide
+            else:
+                cached_is_random_word = self.is_random_word
+                decide = lambda word: (cached_is_random_word(word),)
+            _set(self, 'is_random_word', _Tracer(tracer, trace_sample_rate).wrap(decide, self.explain))
+
+    def __setattr__(self, name, value):
+        """Detectors are immutable, so they can be shared between threads without locks."""
+        raise AttributeError(
+            f"{type(self).__name__} is immutable; use replace({name}=...) to derive a new detector")
+
+    def __delattr__(self, name):
+        """Detectors are immutable, so they can be shared between threads without locks."""
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def _config(self) -> Dict[str, object]:
+        """Get the keyword arguments that construct this detector."""
+        return {
+            'bigrams_probs': self.bigrams,
+            'common_bigrams_threshold': self.common_bigrams_threshold,
+            'uncommon_bigrams_threshold': self.uncommon_bigrams_threshold,
+            'duplicated_bigrams_threshold': self.duplicated_bigrams_threshold,
+            'allow_numbers': self.allow_numbers,
+            'keyboard_layout': self.keyboard_layout,
+            'max_token_length': self.max_token_length,
+            'max_tokens': self.max_tokens,
+            'time_budget': self.time_budget,
+            'cache': self.cache,
+            'metrics': self.metrics,
+            'tracer': self.tracer,
+            'trace_sample_rate': self.trace_sample_rate,
+        }
+
+    def __reduce__(self):
+        """Pickle compactly: bundled tables and layouts by name, custom tables as binary.
+
+        See random_string_detector.serialization.
+        """
+        from random_string_detector.serialization import restore_detector, table_reference
+        return (restore_detector, (
+            type(self),
+            table_reference(self.bigrams),
+            self.common_bigrams_threshold,
+            self.uncommon_bigrams_threshold,
+            self.duplicated_bigrams_threshold,
+            self.allow_numbers,
+            self.keyboard_layout,
+            self.cache,
+            (self.max_token_length, self.max_tokens, self.time_budget),
+        ))
+
+    @property
+    def fingerprint(self) -> bytes:
+        """16-byte digest of the settings that affect verdicts, for keying caches."""
+        if self._fingerprint is None:
+            digest = hashlib.blake2b(digest_size=16)
+            digest.update(repr((
+                self.common_bigrams_threshold,
+                self.uncommon_bigrams_threshold,
+                self.duplicated_bigrams_threshold,
+                self.allow_numbers,
+            )).encode())
+            for bigram, prob in sorted(self.bigrams.items()):
+                digest.update(f"{bigram}\0{prob!r}\0".encode('utf-8', 'surrogatepass'))
+            if self.keyboard_layout is not None:
+                digest.update(repr((self.keyboard_layout.rows, self.keyboard_layout.offsets)).encode())
+            # Only the token length limit changes word verdicts
+            if self.max_token_length is not None:
+                digest.update(f"max_token_length={self.max_token_length}".encode())
+            object.__setattr__(self, '_fingerprint', digest.digest())
+        return self._fingerprint
+
+    def replace(self, **changes) -> "RandomStringDetector":
+        """Create a new detector with some of the settings changed.
+
+        A cache only matches one configuration, so it is not carried over to the
+        new detector unless it is passed again in changes.
+
+        Args:
+        - changes: keyword arguments of RandomStringDetector to change
+
+        Returns:
+        - a new RandomStringDetector
+        """
+        config = self._config()
+        config['cache'] = None
+        config.update(changes)
+        return type(self)(**config)
+
+    def _word_features(self, word: str) -> "_WordFeatures":
+        """Compute the word-level features used by the alphanumeric bigram check.
+
+        Args:
+        - word: the full (lowercased) word
+
+        Returns:
+        - a _WordFeatures record shared by all bigrams of the word
+        """
+        return _WordFeatures(
+            word,
+            self._has_alternating_pattern(word),
+            self._looks_like_hex(word),
+        )
+
+    def _is_likely_random_alphanumeric_bigram(
+            self, bigram: str, full_word: str, features: "_WordFeatures" = None) -> bool:
         """Check if an alphanumeric bigram is likely random or part of a structured pattern.
         
         Args:
         - bigram: the two-character bigram to check
         - full_word: the full word context
+        - features: precomputed word features (computed from full_word if omitted)
         
         Returns:
         - True if the bigram appears to be random, False if it's likely legitimate
         """
+        if features is None:
+            features = self._word_features(full_word)
+
         # Check for patterns that suggest randomness first
-        if self._has_alternating_pattern(full_word) or self._looks_like_hex(full_word):
+        if features.alternating or features.hex_like:
             return True
         
         # For shorter words (< 10 chars), be more strict about numbers
         # This handles cases like "user123", "admin999" which should be flagged as random
-        if len(full_word) < 10:
-            # Count how many characters are letters vs digits
-            letter_count = sum(1 for c in full_word if c.isalpha())
-            digit_count = sum(1 for c in full_word if c.isdigit())
-            
+        if features.length < 10:
             # If less than 6 letters, or if digits make up >30% of the word, treat as random
-            if letter_count < 6 or digit_count / len(full_word) > 0.3:
+            if features.letter_count < 6 or features.digit_count / features.length > 0.3:
                 return True
             else:
                 # Short word that doesn't meet random criteria - legitimate
@@ -115,42 +443,28 @@ class RandomStringDetector(object):
         # For longer words (>= 10 chars), be more lenient but still detect mixed patterns
         # This handles cases like "chicagofan23" which should not be flagged
         else:
-            # Check for mixed alphanumeric patterns that suggest randomness
-            # Count digit clusters vs letter clusters
-            clusters = []
-            current_cluster_type = None
-            
-            for char in full_word:
-                char_type = 'digit' if char.isdigit() else 'letter'
-                if char_type != current_cluster_type:
-                    clusters.append(char_type)
-                    current_cluster_type = char_type
-            
             # If there are 3 or more alternating clusters, it's likely random
             # e.g., "test123user" -> ['letter', 'digit', 'letter'] = 3 clusters (random)
             # e.g., "chicagofan23" -> ['letter', 'digit'] = 2 clusters (legitimate)
-            if len(clusters) >= 3:
+            if features.cluster_count >= 3:
                 return True
                 
             # If both characters are digits at the end, likely a legitimate number suffix
+            # (the last occurrence is in the suffix iff the suffix contains the bigram;
+            # searching only the suffix keeps long words linear)
             if bigram.isdigit():
-                bigram_pos = full_word.rfind(bigram)
-                if bigram_pos >= len(full_word) - 4:  # Within last 4 characters
+                if full_word.find(bigram, features.length - 4) >= 0:  # Within last 4 characters
                     return False
             
             # Mixed letter-digit bigrams are often legitimate in longer words
             if any(c.isdigit() for c in bigram) and any(c.isalpha() for c in bigram):
-                bigram_pos = full_word.rfind(bigram)
                 # More lenient for longer words - allow digit bigrams in the last part
-                if bigram_pos >= len(full_word) - 6:  # Within last 6 characters
+                if full_word.find(bigram, features.length - 6) >= 0:  # Within last 6 characters
                     return False
             
             # For longer words, be very lenient - only flag if it really looks random
             # This allows most legitimate usernames with numbers to pass
             return False
-        
-        # Default for shorter words: digit-containing bigrams are treated as random
-        return True
     
     def _has_alternating_pattern(self, word: str) -> bool:
         """Check if word has alternating letter-digit pattern suggesting randomness."""
@@ -176,6 +490,28 @@ class RandomStringDetector(object):
         # If most characters are valid hex and it's long enough, likely a hash
         return hex_count / len(word) > 0.8 and len(word) >= 8
 
+    def _adjusted_uncommon_threshold(self, length: int) -> float:
+        """Get the uncommon bigrams threshold for a word of the given length."""
+        # Adjust thresholds based on word length for more nuanced detection
+        # Longer words are more likely to contain some uncommon bigrams naturally
+        if length >= 12:
+            # Very long words: be very lenient (allow up to 20% uncommon bigrams)
+            return 0.2
+        elif length >= 10:
+            # Long words: be more lenient (allow up to 15% uncommon bigrams)
+            return 0.15
+        else:
+            # Short words: use the original strict threshold
+            return self.uncommon_bigrams_threshold
+
+    def _cached_is_random_word(self, word: str):
+        """Check if a word is random typing, going through the verdict cache."""
+        verdict = self.cache.get(word)
+        if verdict is None:
+            verdict = type(self).is_random_word(self, word)
+            self.cache.set(word, verdict)
+        return verdict
+
     def is_random_word(self, word: str):
         """Check if a word is random typing or not.
 
@@ -185,30 +521,81 @@ class RandomStringDetector(object):
         Returns:
         - True if the word is random typing, False otherwise
         """
+        return self._decide(word)[0]
+
+    def explain(self, word: str) -> Tuple[bool, str, Optional[Dict[str, int]]]:
+        """Check if a word is random typing, and tell which rule decided it.
+
+        Args:
+        - word: word to check.
+
+        Returns:
+        - (verdict, deciding rule, counts), where the rule is one of RULES and counts
+          has the bigram counts ("bigrams", "common", "uncommon", "duplicated"), or is
+          None if the word was decided before its bigrams were counted
+        """
+        verdict, rule = self._decide(word)
+        if rule in _BIGRAM_RULES:
+            total, common, uncommon, duplicated = self._bigram_counts(word.lower())
+            counts = {'bigrams': total, 'common': common, 'uncommon': uncommon, 'duplicated': duplicated}
+        else:
+            counts = None
+        return verdict, rule, counts
+
+    def _decide(self, word: str) -> Tuple[bool, str]:
+        """Check if a word is random typing, and get the (verdict, rule) that decided it."""
+        if self.max_token_length is not None and len(word) > self.max_token_length:
+            return _TOO_LONG
+
         # Allow only words longer than 3 characters
         if self.allow_numbers:
             # Allow letters and numbers
             if len(word) < 4:
-                return False
+                return _TOO_SHORT
         else:
             # Allow only letters
-            if len(word) < 4 or not word.isalpha():
-                return False
+            if len(word) < 4:
+                return _TOO_SHORT
+            if not word.isalpha():
+                return _NOT_ALPHABETIC
 
         # Return True if the word contains only digits (pure numbers are always random)
         if word.isdigit():
-            return True
+            return _DIGITS_ONLY
         
         # Return True if the word is a single character repeated multiple times
         if len(set(word)) == 1:
-            return True
+            return _REPEATED_CHARACTER
 
         # Check for keyboard patterns (only for alphabetic words)
         if word.isalpha() and is_keyboard_pattern(word):
-            return True
+            return _KEYBOARD_PATTERN
+
+        # Check for keyboard walks on the configured layout
+        if self.keyboard_layout is not None and self.keyboard_layout.is_walk(word):
+            return _KEYBOARD_WALK
 
         word = word.lower()
+        num_bigrams, _, num_uncommon_bigrams, num_duplicated_bigrams = self._bigram_counts(word)
 
+        adjusted_uncommon_threshold = self._adjusted_uncommon_threshold(len(word))
+
+        # Higher number wins
+        # if uncommon_bigrams is more than n of the bigrams, return True
+        if num_bigrams > 0 and num_uncommon_bigrams / num_bigrams > adjusted_uncommon_threshold:
+            return _UNCOMMON_BIGRAMS
+        # if more than n of the bigrams are duplicated, return True
+        elif num_bigrams > 0 and num_duplicated_bigrams / num_bigrams > self.duplicated_bigrams_threshold:
+            return _DUPLICATED_BIGRAMS
+        else:
+            return _COMMON_BIGRAMS
+
+    def _bigram_counts(self, word: str) -> Tuple[int, int, int, int]:
+        """Count the bigrams of a (lowercased) word.
+
+        Returns:
+        - (number of bigrams, common, uncommon, duplicated)
+        """
         # Get list of bigrams from the word
         bigrams = [word[i:i + 2] for i in range(len(word) - 1)]
 
@@ -216,43 +603,30 @@ class RandomStringDetector(object):
         num_common_bigrams = 0
         num_uncommon_bigrams = 0
         num_duplicated_bigrams = len(bigrams) - len(set(bigrams))
-        
+        # Word-level features for digit bigrams, computed at most once per word
+        features = None
+        rank = self._bigram_ranks.get
+        missing_rank = self._missing_rank
+        cutoff = self._common_cutoff
+
         for bigram in bigrams:
             if self.allow_numbers and any(c.isdigit() for c in bigram):
+                if features is None:
+                    features = self._word_features(word)
                 # For bigrams containing digits, be more selective
                 # Only treat as uncommon if it looks like a random pattern
-                if self._is_likely_random_alphanumeric_bigram(bigram, word):
+                if self._is_likely_random_alphanumeric_bigram(bigram, word, features):
                     num_uncommon_bigrams += 1
                 else:
                     # Treat legitimate digit bigrams as common to avoid skewing the ratio
                     # This allows usernames like "chicagofan23" to not be flagged
                     num_common_bigrams += 1
-            elif self.bigrams.get(bigram, 0) > self.common_bigrams_threshold:
+            elif rank(bigram, missing_rank) >= cutoff:
                 num_common_bigrams += 1
             else:
                 num_uncommon_bigrams += 1
 
-        # Adjust thresholds based on word length for more nuanced detection
-        # Longer words are more likely to contain some uncommon bigrams naturally
-        if len(word) >= 12:
-            # Very long words: be very lenient (allow up to 20% uncommon bigrams)
-            adjusted_uncommon_threshold = 0.2
-        elif len(word) >= 10:
-            # Long words: be more lenient (allow up to 15% uncommon bigrams)
-            adjusted_uncommon_threshold = 0.15
-        else:
-            # Short words: use the original strict threshold
-            adjusted_uncommon_threshold = self.uncommon_bigrams_threshold
-
-        # Higher number wins
-        # if uncommon_bigrams is more than n of the bigrams, return True
-        if len(bigrams) > 0 and num_uncommon_bigrams / len(bigrams) > adjusted_uncommon_threshold:
-            return True
-        # if more than n of the bigrams are duplicated, return True
-        elif len(bigrams) > 0 and num_duplicated_bigrams / len(bigrams) > self.duplicated_bigrams_threshold:
-            return True
-        else:
-            return False
+        return len(bigrams), num_common_bigrams, num_uncommon_bigrams, num_duplicated_bigrams
 
     def __call__(self, text: str, threshold: float = 0.5):
         """Check if the input text of a given user is random typing using pt_bigrams_dict.
@@ -264,15 +638,200 @@ class RandomStringDetector(object):
         Returns:
         - True if the input text is random typing, False otherwise
         """
-        words = text.lower().split()
-        if not words:  # Handle empty string case
-            return False
-            
+        metrics = self.metrics
+        start = time.perf_counter() if metrics is not None and metrics.sample() else None
+        if self.max_tokens is None and self.time_budget is None:
+            # Without limits the whole text is scored, so splitting it at once is
+            # faster than scanning its tokens lazily (str.split() splits on the same
+            # whitespace as TOKEN_PATTERN)
+            truncated = False
+            words = text.lower().split()
+            num_words = len(words)
+            counter = 0
+            is_random_word = self.is_random_word
+            for word in words:
+                if is_random_word(word):
+                    counter += 1
+        else:
+            num_words, counter, truncated = self._count_random_tokens_limited(text)
+
+        # Handle empty string case
+        result = bool(num_words) and counter / num_words >= threshold
+        if metrics is not None:
+            metrics.observe_document(num_words, counter, result,
+                                     None if start is None else time.perf_counter() - start,
+                                     truncated)
+        return result
+
+    def _count_random_tokens_limited(self, text: str) -> Tuple[int, int, bool]:
+        """Score the tokens of a text within max_tokens and time_budget.
+
+        Returns:
+        - (number of tokens scored, number of random tokens, whether a limit was hit)
+        """
+        max_tokens = self.max_tokens
+        deadline = None if self.time_budget is None else time.perf_counter() + self.time_budget
+        num_words = 0
         counter = 0
-        for word in words:
-            if self.is_random_word(word):
+        for match in TOKEN_PATTERN.finditer(text):
+            if num_words == max_tokens:
+                return num_words, counter, True
+            if (deadline is not None and num_words % TIME_CHECK_INTERVAL == 0 and num_words
+                    and time.perf_counter() > deadline):
+                return num_words, counter, True
+            num_words += 1
+            if self.is_random_word(match.group().lower()):
                 counter += 1
+        return num_words, counter, False
 
-        if counter / len(words) >= threshold:
-            return True
-        return False
+    def batch(self, texts: Iterable[str], threshold: float = 0.5,
+              max_workers: Optional[int] = None, processes: bool = False) -> List[bool]:
+        """Check a batch of texts, scoring them on a thread or process pool.
+
+        Threads only speed up scoring on free-threaded (no-GIL) builds of Python, so
+        by default the batch is scored on one thread per CPU there and inline
+        otherwise. Processes default to one per CPU.
+        See random_string_detector.parallel.detect_batch.
+
+        Args:
+        - texts: input texts.
+        - threshold: threshold to determine if a text is random typing or not.
+        - max_workers: number of workers (default depends on the build, see above).
+        - processes: whether to score on a process pool instead of a thread pool.
+
+        Returns:
+        - list with the result of __call__ for each text, in order
+        """
+        from random_string_detector.parallel import detect_batch
+        return detect_batch(self, texts, threshold=threshold, max_workers=max_workers,
+                            processes=processes)
+
+    def iter_random_spans(self, text: str) -> Iterator[Tuple[int, int]]:
+        """Lazily yield the character offsets of random tokens in the input text.
+
+        Tokens are scored as the text is scanned, the same way __call__ scores them.
+
+        Args:
+        - text: input text of a given user.
+
+        Returns:
+        - iterator of (start, end) spans of the tokens detected as random typing
+        """
+        for match in TOKEN_PATTERN.finditer(text):
+            if self.is_random_word(match.group().lower()):
+                yield match.span()
+
+    def iter_random_windows(self, text: str, window: int = 12) -> Iterator[Tuple[int, int]]:
+        """Lazily yield the character offsets of random regions in an unsegmented string.
+
+        Every window of `window` characters is scored with the same bigram ratios as
+        is_random_word, using running counts over the bigrams of the string, so the
+        whole string is scanned in O(n) regardless of the window size. Overlapping
+        random windows are merged into a single span.
+
+        Bigrams with characters other than letters (or digits, with allow_numbers)
+        are ignored, so separators in URLs, paths and handles do not count as
+        uncommon. Windows where fewer than half of the bigrams are scored are skipped.
+        Bigrams with digits are judged as is_random_word judges them, with the run
+        of letters and digits they are in as the word, so "chicagofan23" is not
+        flagged within a string either.
+
+        Args:
+        - text: string to scan, e.g. a URL, a concatenated handle or a base64 blob.
+        - window: number of characters in each window (at least 4).
+
+        Returns:
+        - iterator of (start, end) spans of the random regions
+        """
+        if window < 4:
+            raise ValueError("window must be at least 4 characters")
+
+        span = window - 1  # bigrams per window
+        num_bigrams = len(text) - 1
+        if num_bigrams < span:
+            return
+
+        # Per-bigram key (None if not scored) and prefix sums of scored/uncommon bigrams
+        keys = []
+        scored_prefix = [0]
+        uncommon_prefix = [0]
+        scored = 0
+        uncommon = 0
+        rank = self._bigram_ranks.get
+        missing_rank = self._missing_rank
+        cutoff = self._common_cutoff
+        # Run of letters and digits around the current digit bigram, and its features
+        run_end = 0
+        word = features = None
+        for i in range(num_bigrams):
+            bigram = text[i:i + 2].lower()
+            if bigram.isalpha():
+                scored += 1
+                if rank(bigram, missing_rank) < cutoff:
+                    uncommon += 1
+            elif self.allow_numbers and bigram.isalnum():
+                scored += 1
+                if any(c.isdigit() for c in bigram):
+                    if i >= run_end:
+                        # Each run is delimited and scanned once, so the text stays O(n)
+                        run_start = i
+                        while run_start and text[run_start - 1].isalnum():
+                            run_start -= 1
+                        run_end = i + 2
+                        while run_end < len(text) and text[run_end].isalnum():
+                            run_end += 1
+                        word = text[run_start:run_end].lower()
+                        features = self._word_features(word)
+                    if self._is_likely_random_alphanumeric_bigram(bigram, word, features):
+                        uncommon += 1
+                elif rank(bigram, missing_rank) < cutoff:
+                    uncommon += 1
+            else:
+                bigram = None
+            keys.append(bigram)
+            scored_prefix.append(scored)
+            uncommon_prefix.append(uncommon)
+
+        uncommon_threshold = self._adjusted_uncommon_threshold(window)
+        min_scored = max(span // 2, 1)
+
+        # Bigram counts within the current window, for the duplicated bigrams ratio
+        counts = {}
+        duplicated = 0
+        for key in keys[:span]:
+            if key is not None:
+                if key in counts:
+                    duplicated += 1
+                counts[key] = counts.get(key, 0) + 1
+
+        current_start = current_end = None
+        for start in range(num_bigrams - span + 1):
+            if start:
+                # Slide the window by one bigram
+                removed = keys[start - 1]
+                if removed is not None:
+                    counts[removed] -= 1
+                    if counts[removed]:
+                        duplicated -= 1
+                added = keys[start + span - 1]
+                if added is not None:
+                    if counts.get(added):
+                        duplicated += 1
+                    counts[added] = counts.get(added, 0) + 1
+
+            num_scored = scored_prefix[start + span] - scored_prefix[start]
+            if num_scored < min_scored:
+                continue
+            num_uncommon = uncommon_prefix[start + span] - uncommon_prefix[start]
+            if (num_uncommon / num_scored > uncommon_threshold or
+                    duplicated / num_scored > self.duplicated_bigrams_threshold):
+                end = start + window
+                if current_end is not None and start <= current_end:
+                    current_end = end
+                else:
+                    if current_end is not None:
+                        yield current_start, current_end
+                    current_start, current_end = start, end
+
+        if current_end is not None:
+            yield current_start, current_end
@@ -0,0 +1,288 @@
+"""Follow growing log files and check each new line for random strings.
+
+Only bytes appended since the last poll are read, at most READ_SIZE bytes
+per file and poll, so a large backlog is scored over several polls. Files are tracked by device
+and inode, so rotation (rename and recreate) and truncation (copytruncate) are
+detected: the rest of a rotated file is read before switching to the new one.
+Byte offsets are checkpointed to a JSON file after each batch has been handled,
+so a restarted follower resumes where it stopped, without rescanning or
+skipping lines. A file rotated while the follower was stopped is looked up by
+inode in its directory, and its rest is read before the new file; if it was
+moved elsewhere or compressed, the lines after the checkpoint are lost.
+
+Run with: python -m random_string_detector.follow /var/log/app.log --checkpoint offsets.json
+"""
+import argparse
+import json
+import os
+import time
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from random_string_detector.detector import RandomStringDetector
+
+# Maximum number of bytes read from one file per poll
+READ_SIZE = 1 << 20
+
+Verdict = Tuple[str, str, bool]
+
+
+class _FileState(object):
+    """Position of the follower in one file."""
+
+    __slots__ = ('path', 'handle', 'device', 'inode', 'offset', 'at_end')
+
+    def __init__(self, path: str, at_end: bool = False):
+        self.path = path
+        self.handle = None
+        self.device = None
+        self.inode = None
+        self.offset = 0
+        # Whether the file is followed from its end when first opened
+        self.at_end = at_end
+
+
+def _find_rotated(path: str, device: int, inode: int) -> Optional[str]:
+    """Find the file a followed path was renamed to, by device and inode, in its directory."""
+    try:
+        with os.scandir(os.path.dirname(path) or '.') as entries:
+            for entry in entries:
+                if entry.inode() == inode and entry.is_file(follow_symlinks=False) \
+                        and entry.stat(follow_symlinks=False).st_dev == device:
+                    return entry.path
+    except OSError:
+        pass
+    return None
+
+
+class LogFollower(object):
+    """Tail log files and score newly appended lines in batches."""
+
+    def __init__(self, paths: Sequence[str], detector: Optional[RandomStringDetector] = None,
+                 checkpoint_path: Optional[str] = None, threshold: float = 0.5,
+                 start_at_end: bool = False, encoding: str = 'utf-8'):
+        """Initialize a LogFollower object.
+
+        Attributes:
+        - paths (list): files to follow; they need not exist yet.
+        - detector (RandomStringDetector): detector scoring each line.
+        - checkpoint_path (str): JSON file where offsets are saved (no checkpoints if None).
+        - threshold (float): threshold passed to the detector.
+        - start_at_end (bool): whether files that exist already and have no checkpoint
+          are followed from their end rather than their beginning; files created
+          later are always read from their beginning.
+        - encoding (str): encoding of the files (undecodable bytes are replaced).
+        """
+        self.paths = list(paths)
+        self.detector = detector if detector is not None else RandomStringDetector()
+        self.checkpoint_path = checkpoint_path
+        self.threshold = threshold
+        self.start_at_end = start_at_end
+        self.encoding = encoding
+        self._files = {path: _FileState(path, start_at_end and os.path.exists(path))
+                       for path in self.paths}
+        self._checkpoint = self._load_checkpoint()
+
+    # Checkpoints
+
+    def _load_checkpoint(self) -> Dict[str, Dict[str, int]]:
+        if self.checkpoint_path is None or not os.path.exists(self.checkpoint_path):
+            return {}
+        with open(self.checkpoint_path, encoding='utf-8') as f:
+            return json.load(f)
+
+    def _offsets(self) -> Dict[str, Dict[str, int]]:
+        """Current position in each opened file."""
+        return {
+            state.path: {'device': state.device, 'inode': state.inode, 'offset': state.offset}
+            for state in self._files.values() if state.inode is not None
+        }
+
+    def save_checkpoint(self):
+        """Atomically write the current offsets to the checkpoint file."""
+        if self.checkpoint_path is None:
+            return
+        self._checkpoint = self._offsets()
+        temporary = self.checkpoint_path + '.tmp'
+        with open(temporary, 'w', encoding='utf-8') as f:
+            json.dump(self._checkpoint, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporary, self.checkpoint_path)
+
+    # Reading
+
+    def _open(self, state: _FileState, rotated: bool = False) -> bool:
+        """Open a file that is not open yet, positioning it from the checkpoint.
+
+        If the file was rotated since the checkpoint, the old file is opened
+        instead when it can be found, so that its rest is read first.
+        """
+        saved = self._checkpoint.get(state.path)
+        path = state.path
+        if saved and not rotated:
+            try:
+                stat = os.stat(path)
+                moved = (stat.st_dev, stat.st_ino) != (saved['device'], saved['inode'])
+            except FileNotFoundError:
+                moved = True
+            if moved:
+                path = _find_rotated(path, saved['device'], saved['inode']) or path
+        try:
+            handle = open(path, 'rb')
+        except FileNotFoundError:
+            return False
+        stat = os.fstat(handle.fileno())
+        if saved and (saved['device'], saved['inode']) == (stat.st_dev, stat.st_ino) \
+                and saved['offset'] <= stat.st_size:
+            offset = saved['offset']
+        elif state.at_end and not saved and not rotated:
+            offset = stat.st_size
+        else:
+            # New file, rotated since the checkpoint, or truncated
+            offset = 0
+        state.at_end = False
+        state.handle = handle
+        state.device = stat.st_dev
+        state.inode = stat.st_ino
+        state.offset = offset
+        return True
+
+    def _read_lines(self, state: _FileState, size: int, final: bool = False) -> Tuple[List[str], int, bool]:
+        """Read the complete lines appended to an open file since the last read, up to size bytes.
+
+        With final=True (a rotated file), a trailing line without newline is read too.
+
+        Returns:
+        - (lines, number of bytes consumed, whether bytes were left unread)
+        """
+        if size <= 0:
+            return [], 0, True
+        state.handle.seek(state.offset)
+        data = state.handle.read(size)
+        more = len(data) == size
+        end = len(data) if final and not more else data.rfind(b'\n') + 1
+        if not end and more and size == READ_SIZE:
+            # A line longer than READ_SIZE is split rather than waited for
+            end = len(data)
+        if not end:
+            return [], 0, more
+        state.offset += end
+        # Only newlines end log lines, unlike the separators str.splitlines() also splits on
+        lines = data[:end].decode(self.encoding, 'replace').split('\n')
+        if not lines[-1]:
+            lines.pop()
+        return [line[:-1] if line.endswith('\r') else line for line in lines], end, more
+
+    def _poll_file(self, state: _FileState) -> List[str]:
+        """Read the new lines of one file, following rotation and truncation."""
+        if state.handle is None and not self._open(state):
+            return []
+        lines, size, more = self._read_lines(state, READ_SIZE)
+        if more:
+            # The rest is read by the next polls
+            return lines
+        budget = READ_SIZE - size
+        try:
+            stat = os.stat(state.path)
+        except FileNotFoundError:
+            # Rotated away and not recreated yet: keep reading the old file
+            return lines
+        if (stat.st_dev, stat.st_ino) != (state.device, state.inode):
+            # Rotated: finish the old file, then start the new one
+            rest, size, more = self._read_lines(state, budget, final=True)
+            lines.extend(rest)
+            if more:
+                return lines
+            state.handle.close()
+            state.handle = None
+            if self._open(state, rotated=True):
+                lines.extend(self._read_lines(state, budget - size)[0])
+        elif stat.st_size < state.offset:
+            # Truncated in place
+            state.offset = 0
+            lines.extend(self._read_lines(state, budget)[0])
+        return lines
+
+    def _poll(self) -> List[Verdict]:
+        """Read and score the lines appended to all files, without checkpointing."""
+        new_lines = [(state.path, line) for state in self._files.values()
+                     for line in self._poll_file(state)]
+        verdicts = self.detector.batch([line for _, line in new_lines], self.threshold)
+        return [(path, line, verdict) for (path, line), verdict in zip(new_lines, verdicts)]
+
+    def _commit(self):
+        """Save the checkpoint if any offset moved since it was last saved."""
+        if self._offsets() != self._checkpoint:
+            self.save_checkpoint()
+
+    def poll(self, handler: Optional[Callable[[List[Verdict]], None]] = None) -> List[Verdict]:
+        """Read and score the lines appended to all files since the last poll.
+
+        The checkpoint is saved after the handler has returned, so lines whose
+        handling did not complete are scanned again after a restart.
+
+        Args:
+        - handler: function called with the verdicts before the checkpoint is saved
+
+        Returns:
+        - list of (path, line, verdict) for each new line, in file order
+        """
+        results = self._poll()
+        if handler is not None:
+            handler(results)
+        self._commit()
+        return results
+
+    def follow(self, interval: float = 1.0) -> Iterator[Verdict]:
+        """Poll forever, yielding (path, line, verdict) for each new line.
+
+        The checkpoint is saved once all lines of a poll have been consumed.
+
+        Args:
+        - interval: seconds to wait between polls that found no new lines
+        """
+        while True:
+            results = self._poll()
+            yield from results
+            self._commit()
+            if not results:
+                time.sleep(interval)
+
+    def close(self):
+        """Close the followed files."""
+        for state in self._files.values():
+            if state.handle is not None:
+                state.handle.close()
+                state.handle = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def main(argv: Optional[List[str]] = None):
+    """Command line entry point: print the random lines of the followed files."""
+    parser = argparse.ArgumentParser(description="Follow log files and print lines with random strings.")
+    parser.add_argument('paths', nargs='+', help="log files to follow")
+    parser.add_argument('--checkpoint', help="JSON file where offsets are saved between runs")
+    parser.add_argument('--threshold', type=float, default=0.5)
+    parser.add_argument('--allow-numbers', action='store_true')
+    parser.add_argument('--from-end', action='store_true',
+                        help="start at the end of files without a checkpoint")
+    parser.add_argument('--interval', type=float, default=1.0, help="seconds between polls when idle")
+    args = parser.parse_args(argv)
+
+    detector = RandomStringDetector(allow_numbers=args.allow_numbers)
+    with LogFollower(args.paths, detector, args.checkpoint, args.threshold, args.from_end) as follower:
+        try:
+            for path, line, verdict in follower.follow(args.interval):
+                if verdict:
+                    print(f"{path}: {line}", flush=True)
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,123 @@
+"""Memory footprint of detectors, bigram tables, caches and preprocessing.
+
+Sizes are deep: an object is counted with everything it references, each
+object once. Classes, functions and modules are code rather than data and are
+not counted. Shared memory blocks (SharedBigramTable, SharedVerdictCache) are
+mapped into every attached process and are reported apart, as shared_memory.
+
+Usage:
+    detector_footprint(detector)            # bytes per component of one detector
+    shared_footprint([detector_a, detector_b])  # what the detectors share
+"""
+import gc
+import sys
+import types
+from typing import Dict, Iterable, Optional, Set
+
+# Objects that are code, not data
+_SKIPPED_TYPES = (type, types.ModuleType, types.FunctionType, types.BuiltinFunctionType,
+                  types.CodeType, types.MethodDescriptorType, types.WrapperDescriptorType)
+
+
+def deep_sizeof(obj, seen: Optional[Set[int]] = None) -> int:
+    """Get the size in bytes of an object and of everything it references.
+
+    Args:
+    - obj: object to measure
+    - seen: ids of objects already counted, which are skipped and updated, so
+      that several calls with the same set count shared objects only once
+
+    Returns:
+    - size in bytes
+    """
+    if seen is None:
+        seen = set()
+    if obj is None:
+        return 0
+    size = 0
+    stack = [obj]
+    while stack:
+        current = stack.pop()
+        if id(current) in seen or isinstance(current, _SKIPPED_TYPES):
+            continue
+        seen.add(id(current))
+        size += sys.getsizeof(current)
+        if type(current) is dict:
+            # The garbage collector does not visit the keys of dicts with only
+            # string keys, since strings cannot form cycles
+            stack.extend(current.keys())
+            stack.extend(current.values())
+        else:
+            stack.extend(gc.get_referents(current))
+    return size
+
+
+def _shared_memory_size(obj) -> int:
+    shm = getattr(obj, '_shm', None)
+    return shm.size if shm is not None and getattr(obj, '_buf', None) is not None else 0
+
+
+def detector_footprint(detector, seen: Optional[Set[int]] = None) -> Dict[str, int]:
+    """Get the memory footprint of a RandomStringDetector, by component.
+
+    Components are counted in the order below, so an object referenced by two
+    of them (e.g. the bigram strings of the table and of the compiled table)
+    is counted in the first one.
+
+    Args:
+    - detector: a RandomStringDetector
+    - seen: ids of objects already counted (see deep_sizeof)
+
+    Returns:
+    - dict of bytes for "bigram_table", "compiled" (the compiled table, shared by
+      all detectors on the same bigram table, and the fingerprint),
+      "keyboard_layout", "cache", "metrics", "instance" (the rest of the
+      detector), "total" (all of the above) and "shared_memory" (shared memory
+      blocks of the table and cache, not part of the total)
+    """
+    if seen is None:
+        seen = set()
+    state = vars(detector)
+    footprint = {
+        'bigram_table': deep_sizeof(detector.bigrams, seen),
+        'compiled': sum(deep_sizeof(state.get(name), seen) for name in ('_compiled', '_fingerprint')),
+        'keyboard_layout': deep_sizeof(detector.keyboard_layout, seen),
+        'cache': deep_sizeof(detector.cache, seen),
+        'metrics': deep_sizeof(detector.metrics, seen),
+    }
+    footprint['instance'] = deep_sizeof(detector, seen)
+    footprint['total'] = sum(footprint.values())
+    footprint['shared_memory'] = _shared_memory_size(detector.bigrams) + _shared_memory_size(detector.cache)
+    return footprint
+
+
+def preprocessing_footprint(preprocessing, seen: Optional[Set[int]] = None) -> Dict[str, int]:
+    """Get the memory footprint of a TextPreprocessing object.
+
+    Returns:
+    - dict of bytes for "stopwords", "instance" (the rest) and "total"
+    """
+    if seen is None:
+        seen = set()
+    footprint = {'stopwords': deep_sizeof(preprocessing.stopwords, seen)}
+    footprint['instance'] = deep_sizeof(preprocessing, seen)
+    footprint['total'] = sum(footprint.values())
+    return footprint
+
+
+def shared_footprint(objects: Iterable) -> Dict[str, int]:
+    """Get how much memory a group of objects (e.g. detectors) share.
+
+    Args:
+    - objects: objects to measure together
+
+    Returns:
+    - dict of bytes: "separate" (sum of the deep size of each object alone),
+      "combined" (deep size of all objects together, shared parts counted once)
+      and "shared" (separate - combined, what sharing saves)
+    """
+    objects = list(objects)
+    separate = sum(deep_sizeof(obj) for obj in objects)
+    seen = set()
+    combined = sum(deep_sizeof(obj, seen) for obj in objects)
+    return {'separate': separate, 'combined': combined, 'shared': separate - combined}
@@ -0,0 +1,132 @@
+"""Keyboard layouts for detecting keyboard walks such as "qwer", "1qaz" or "azerty".
+
+A layout is defined by its rows of keys and the horizontal offset of each row (in
+key widths). The adjacency graph of the keys is derived from that geometry and
+compiled once into a lookup table from two-character transitions to directions.
+"""
+from types import MappingProxyType
+from typing import Dict, FrozenSet, Sequence
+
+# Horizontal offsets of the number, top, home and bottom rows of a staggered keyboard
+STAGGERED_OFFSETS = (-0.5, 0.0, 0.25, 0.75)
+
+
+class KeyboardLayout(object):
+    """Adjacency graph of a keyboard layout, compiled into a transition table."""
+
+    def __init__(self, name: str, rows: Sequence[str], offsets: Sequence[float] = STAGGERED_OFFSETS):
+        """Initialize a KeyboardLayout object.
+
+        Attributes:
+        - name (str): name of the layout.
+        - rows (tuple): keys of each row, from the top row down.
+        - offsets (tuple): horizontal offset of each row, in key widths.
+        - transitions (MappingProxyType): maps each pair of adjacent keys, e.g. "qw",
+          to the direction of the step between them.
+        """
+        if len(rows) != len(offsets):
+            raise ValueError("rows and offsets must have the same length")
+        self.name = name
+        self.rows = tuple(row.lower() for row in rows)
+        self.offsets = tuple(offsets)
+        self.transitions = MappingProxyType(self._compile())
+
+    def _compile(self) -> Dict[str, int]:
+        """Compile the key geometry into a table of transitions between adjacent keys.
+
+        Keys in the same row are adjacent if they are next to each other, and keys in
+        neighbouring rows are adjacent if they overlap horizontally. Directions are
+        numbered so that every step and its reverse get distinct non-zero codes.
+        """
+        positions = {}
+        for row_index, (row, offset) in enumerate(zip(self.rows, self.offsets)):
+            for column, key in enumerate(row):
+                positions[key] = (row_index, offset + column)
+
+        transitions = {}
+        for a, (row_a, x_a) in positions.items():
+            for b, (row_b, x_b) in positions.items():
+                dy = row_b - row_a
+                dx = x_b - x_a
+                if a == b or abs(dy) > 1 or abs(dx) >= 1 + (dy == 0):
+                    continue
+                # 1..6: right, left, down-right, down-left, up-right, up-left
+                if dy == 0:
+                    direction = 1 if dx > 0 else 2
+                elif dy > 0:
+                    direction = 3 if dx > 0 else 4
+                else:
+                    direction = 5 if dx > 0 else 6
+                transitions[a + b] = direction
+        return transitions
+
+    @property
+    def adjacency(self) -> Dict[str, FrozenSet[str]]:
+        """Adjacency graph of the layout, mapping each key to its neighbouring keys."""
+        graph = {}
+        for pair in self.transitions:
+            graph.setdefault(pair[0], set()).add(pair[1])
+        return {key: frozenset(neighbours) for key, neighbours in graph.items()}
+
+    def is_walk(self, text: str, min_length: int = 4) -> bool:
+        """Check if text is a keyboard walk on this layout.
+
+        A walk is made of straight runs of at least 3 keys, each run stepping in one
+        direction, e.g. "qwer", "poiuyt", "1qaz" or "qazwsx" ("qaz" + "wsx"). Runs
+        may share a key where the walk turns, e.g. "qwerfv" ("qwer" + "rfv").
+        The text is scanned once.
+
+        Args:
+        - text: string to check
+        - min_length: minimum number of characters in a walk
+
+        Returns:
+        - True if text is a keyboard walk, False otherwise
+        """
+        text = text.lower()
+        if len(text) < min_length:
+            return False
+
+        transitions = self.transitions
+        previous = None
+        run = 0
+        for i in range(len(text) - 1):
+            direction = transitions.get(text[i:i + 2], 0)
+            if direction == previous:
+                if not direction:
+                    # Two gaps in a row leave a key outside any run
+                    return False
+                run += 1
+            else:
+                if previous is None:
+                    if not direction:
+                        # The first key is outside any run
+                        return False
+                elif previous and run < 2:
+                    # A run of fewer than 3 keys
+                    return False
+                previous = direction
+                run = 1
+        return bool(previous) and run >= 2
+
+    def __reduce__(self):
+        """Pickle bundled layouts by name, and others by their rows and offsets."""
+        if globals().get(self.name.upper()) is self:
+            return self.name.upper()
+        return (KeyboardLayout, (self.name, self.rows, self.offsets))
+
+    def __eq__(self, other):
+        if not isinstance(other, KeyboardLayout):
+            return NotImplemented
+        return (self.name, self.rows, self.offsets) == (other.name, other.rows, other.offsets)
+
+    def __hash__(self):
+        return hash((self.name, self.rows, self.offsets))
+
+    def __repr__(self):
+        return f"KeyboardLayout({self.name!r})"
+
+
+QWERTY = KeyboardLayout("qwerty", ("1234567890", "qwertyuiop", "asdfghjkl", "zxcvbnm"))
+AZERTY = KeyboardLayout("azerty", ("1234567890", "azertyuiop", "qsdfghjklm", "wxcvbn"))
+QWERTZ = KeyboardLayout("qwertz", ("1234567890", "qwertzuiop", "asdfghjkl", "yxcvbnm"))
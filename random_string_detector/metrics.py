@@ -0,0 +1,236 @@
+"""Throughput, latency and cache metrics in Prometheus text format.
+
+Metrics have no external dependency. Counters are updated once per document
+(not per word) under a lock, so they stay exact on free-threaded builds, and
+latencies are only timed for one call in `sample_every`, so unsampled calls
+cost a countdown.
+
+Usage:
+    registry = MetricsRegistry()
+    detector = RandomStringDetector(metrics=DetectorMetrics(registry, name="usernames"))
+    preprocessing = TextPreprocessing(metrics=PreprocessingMetrics(registry))
+    print(registry.render())
+"""
+import bisect
+import threading
+from typing import Callable, Optional, Sequence, Tuple
+
+# Upper bounds of the latency histogram buckets, in seconds
+LATENCY_BUCKETS = (0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005, 0.001,
+                   0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+def _format_labels(labels: Labels, extra: str = '') -> str:
+    parts = ['%s="%s"' % (key, str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n'))
+             for key, value in labels]
+    if extra:
+        parts.append(extra)
+    return '{%s}' % ','.join(parts) if parts else ''
+
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter(object):
+    """Monotonic counter, safe to increment from several threads."""
+
+    def __init__(self):
+        self.value = 0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: int = 1):
+        """Add amount to the counter."""
+        with self._lock:
+            self.value += amount
+
+
+class Histogram(object):
+    """Histogram of observations with fixed buckets, safe to update from several threads."""
+
+    def __init__(self, buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        """Record one observation."""
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+            self.count += 1
+
+
+class MetricsRegistry(object):
+    """Collection of metric families, rendered in Prometheus text exposition format."""
+
+    def __init__(self):
+        """Initialize a MetricsRegistry object."""
+        self._families = {}
+        self._lock = threading.Lock()
+
+    def _register(self, name: str, kind: str, help_text: str, labels: Labels, metric):
+        with self._lock:
+            family = self._families.setdefault(name, (kind, help_text, {}))
+            if family[0] != kind:
+                raise ValueError(f"metric {name} is already registered as a {family[0]}")
+            family[2][labels] = metric
+        return metric
+
+    def counter(self, name: str, help_text: str, labels: Labels = ()) -> Counter:
+        """Register (or get) a counter."""
+        with self._lock:
+            existing = self._families.get(name, (None, None, {}))[2].get(labels)
+        return existing or self._register(name, 'counter', help_text, labels, Counter())
+
+    def histogram(self, name: str, help_text: str, labels: Labels = (),
+                  buckets: Sequence[float] = LATENCY_BUCKETS) -> Histogram:
+        """Register (or get) a histogram."""
+        with self._lock:
+            existing = self._families.get(name, (None, None, {}))[2].get(labels)
+        return existing or self._register(name, 'histogram', help_text, labels, Histogram(buckets))
+
+    def callback(self, name: str, kind: str, help_text: str, labels: Labels,
+                 function: Callable[[], float]):
+        """Register a counter or gauge whose value is read when rendering."""
+        self._register(name, kind, help_text, labels, function)
+
+    def render(self) -> str:
+        """Render all metrics in Prometheus text exposition format."""
+        lines = []
+        with self._lock:
+            families = [(name, kind, help_text, dict(metrics))
+                        for name, (kind, help_text, metrics) in sorted(self._families.items())]
+        for name, kind, help_text, metrics in families:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, metric in metrics.items():
+                if isinstance(metric, Histogram):
+                    with metric._lock:
+                        counts = list(metric.counts)
+                        total, count = metric.sum, metric.count
+                    cumulative = 0
+                    for bound, bucket_count in zip(metric.buckets + (float('inf'),), counts):
+                        cumulative += bucket_count
+                        le = 'le="%s"' % _format_value(bound)
+                        lines.append(f"{name}_bucket{_format_labels(labels, le)} {cumulative}")
+                    lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(total)}")
+                    lines.append(f"{name}_count{_format_labels(labels)} {count}")
+                else:
+                    value = metric.value if isinstance(metric, Counter) else metric()
+                    lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+        return '\n'.join(lines) + '\n'
+
+
+class _Sampler(object):
+    """Decides which calls are timed: one in every `sample_every`."""
+
+    def __init__(self, sample_every: int):
+        if sample_every < 1:
+            raise ValueError("sample_every must be at least 1")
+        self.sample_every = sample_every
+        self._countdown = sample_every
+
+    def sample(self) -> bool:
+        """Check if the current call should be timed."""
+        # Races between threads only shift which call gets sampled
+        self._countdown -= 1
+        if self._countdown > 0:
+            return False
+        self._countdown = self.sample_every
+        return True
+
+
+class DetectorMetrics(_Sampler):
+    """Metrics of a RandomStringDetector: documents, words, flag rates, latency and caches.
+
+    Pass it as the metrics of a RandomStringDetector; every __call__ (including
+    the calls made by batch()) is counted.
+    """
+
+    def __init__(self, registry: Optional[MetricsRegistry] = None, name: str = 'default',
+                 sample_every: int = 16, prefix: str = 'random_string_detector'):
+        """Initialize a DetectorMetrics object.
+
+        Attributes:
+        - registry (MetricsRegistry): registry the metrics are rendered from.
+        - name (str): value of the "detector" label, to tell detectors apart.
+        - sample_every (int): one call in sample_every is timed.
+        """
+        super().__init__(sample_every)
+        self.registry = registry if registry is not None else MetricsRegistry()
+        self.name = name
+        self.prefix = prefix
+        labels = (('detector', name),)
+        self.documents = self.registry.counter(
+            f'{prefix}_documents_total', 'Documents scored.', labels)
+        self.documents_flagged = self.registry.counter(
+            f'{prefix}_documents_flagged_total', 'Documents detected as random typing.', labels)
+        self.words = self.registry.counter(
+            f'{prefix}_words_total', 'Words scored.', labels)
+        self.words_flagged = self.registry.counter(
+            f'{prefix}_words_flagged_total', 'Words detected as random typing.', labels)
+        self.documents_truncated = self.registry.counter(
+            f'{prefix}_documents_truncated_total',
+            'Documents only partly scored because of max_tokens or time_budget.', labels)
+        self.latency = self.registry.histogram(
+            f'{prefix}_document_latency_seconds', 'Latency of scoring one document (sampled).', labels)
+
+    def observe_document(self, num_words: int, num_flagged: int, flagged: bool, seconds: Optional[float],
+                         truncated: bool = False):
+        """Record one scored document; seconds is None for unsampled calls."""
+        self.documents.inc()
+        self.words.inc(num_words)
+        if num_flagged:
+            self.words_flagged.inc(num_flagged)
+        if flagged:
+            self.documents_flagged.inc()
+        if truncated:
+            self.documents_truncated.inc()
+        if seconds is not None:
+            self.latency.observe(seconds)
+
+    def track_cache(self, cache, cache_name: Optional[str] = None):
+        """Expose the hits and misses of a verdict cache that has a stats() method."""
+        labels = (('detector', self.name), ('cache', cache_name or type(cache).__name__))
+        for key in ('hits', 'misses'):
+            self.registry.callback(
+                f'{self.prefix}_cache_{key}_total', 'counter', f'Verdict cache {key}.', labels,
+                lambda key=key: cache.stats()[key])
+
+
+class PreprocessingMetrics(_Sampler):
+    """Metrics of a TextPreprocessing object: texts processed and latency."""
+
+    def __init__(self, registry: Optional[MetricsRegistry] = None, name: str = 'default',
+                 sample_every: int = 16, prefix: str = 'random_string_detector'):
+        """Initialize a PreprocessingMetrics object.
+
+        Attributes:
+        - registry (MetricsRegistry): registry the metrics are rendered from.
+        - name (str): value of the "preprocessing" label.
+        - sample_every (int): one call in sample_every is timed.
+        """
+        super().__init__(sample_every)
+        self.registry = registry if registry is not None else MetricsRegistry()
+        labels = (('preprocessing', name),)
+        self.texts = self.registry.counter(
+            f'{prefix}_preprocessed_texts_total', 'Texts preprocessed.', labels)
+        self.characters = self.registry.counter(
+            f'{prefix}_preprocessed_characters_total', 'Characters preprocessed.', labels)
+        self.latency = self.registry.histogram(
+            f'{prefix}_preprocessing_latency_seconds', 'Latency of preprocessing one text (sampled).', labels)
+
+    def observe_text(self, num_characters: int, seconds: Optional[float]):
+        """Record one processed text; seconds is None for unsampled calls."""
+        self.texts.inc()
+        self.characters.inc(num_characters)
+        if seconds is not None:
+            self.latency.observe(seconds)
@@ -0,0 +1,82 @@
+"""Parallel batch scoring with RandomStringDetector.
+
+Detectors are immutable, so one instance can be shared by any number of threads.
+On free-threaded (no-GIL) builds of Python, scoring scales with the number of
+threads; on regular builds the GIL serializes scoring, so batches are scored
+inline unless a number of threads is requested explicitly.
+
+Batches can also be scored on a process pool, which scales on any build.
+Detectors pickle compactly (see random_string_detector.serialization), so each
+task only carries the detector's settings and its chunk of texts.
+"""
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Iterable, List, Optional
+
+# Number of chunks per worker, to balance load between threads
+CHUNKS_PER_WORKER = 4
+
+
+def gil_enabled() -> bool:
+    """Check if the GIL is enabled in the running interpreter."""
+    is_gil_enabled = getattr(sys, '_is_gil_enabled', None)
+    return True if is_gil_enabled is None else is_gil_enabled()
+
+
+def default_workers(processes: bool = False) -> int:
+    """Get the default number of workers for batch scoring.
+
+    Args:
+    - processes: whether the workers are processes rather than threads
+
+    Returns:
+    - the number of CPUs for processes and on free-threaded builds, 1 for threads
+      if the GIL is enabled
+    """
+    if gil_enabled() and not processes:
+        return 1
+    return os.cpu_count() or 1
+
+
+def _chunks(items: List[str], num_chunks: int) -> List[List[str]]:
+    """Split items into at most num_chunks contiguous chunks of similar size."""
+    size = -(-len(items) // num_chunks)
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+def _detect_chunk(detector, texts: List[str], threshold: float) -> List[bool]:
+    """Score a chunk of texts."""
+    return [detector(text, threshold) for text in texts]
+
+
+def detect_batch(detector, texts: Iterable[str], threshold: float = 0.5,
+                 max_workers: Optional[int] = None, processes: bool = False) -> List[bool]:
+    """Check a batch of texts with a detector, scoring them on a thread or process pool.
+
+    Args:
+    - detector: a RandomStringDetector (or any callable taking text and threshold,
+      which must be picklable with processes=True)
+    - texts: input texts
+    - threshold: threshold to determine if a text is random typing or not
+    - max_workers: number of workers (default: default_workers(processes))
+    - processes: whether to score on a process pool instead of a thread pool
+
+    Returns:
+    - list with the result of detector(text, threshold) for each text, in order
+    """
+    texts = list(texts)
+    if max_workers is None:
+        max_workers = default_workers(processes)
+    max_workers = min(max_workers, len(texts))
+    if max_workers <= 1:
+        return _detect_chunk(detector, texts, threshold)
+
+    chunks = _chunks(texts, max_workers * CHUNKS_PER_WORKER)
+    results = []
+    pool = ProcessPoolExecutor if processes else ThreadPoolExecutor
+    with pool(max_workers=max_workers) as executor:
+        for chunk_results in executor.map(_detect_chunk, [detector] * len(chunks),
+                                          chunks, [threshold] * len(chunks)):
+            results.extend(chunk_results)
+    return results
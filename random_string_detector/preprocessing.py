@@ -1,5 +1,6 @@
 """This module contains the TextPreprocessing class."""
 import re
+import time
 import unicodedata
 from typing import List
 from string import punctuation
@@ -8,12 +9,14 @@ from unidecode import unidecode
 
 class TextPreprocessing(object):
     """TextPreprocessing is a class that contains methods to process text."""
-    def __init__(self, stopwords: List[str] = None):
+    def __init__(self, stopwords: List[str] = None, metrics=None):
         """Initialize TextPreprocessing object.
 
         Attributes:
         - stopwords: list of stopwords to remove from text
+        - metrics: PreprocessingMetrics updated by every call (see random_string_detector.metrics)
         """
+        self.metrics = metrics
         if stopwords and len(stopwords) > 0:
             self.stopwords = Counter(stopwords)
         else:
@@ -92,8 +95,13 @@ class TextPreprocessing(object):
         Returns:
         - processed text
         """
+        metrics = self.metrics
+        start = time.perf_counter() if metrics is not None and metrics.sample() else None
+        num_characters = len(text)
         text = self.remove_accents(text)
         text = self.remove_punctuation(text)
         text = self.remove_stopwords(text)
         text = self.non_ascii_to_ascii(text)
+        if metrics is not None:
+            metrics.observe_text(num_characters, None if start is None else time.perf_counter() - start)
         return text.strip()
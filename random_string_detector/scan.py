@@ -0,0 +1,306 @@
+"""Field-aware scanning of CSV and JSONL files.
+
+Only the named fields of each row are checked, each with its own detector
+settings (e.g. allow_numbers=True for usernames), and a verdict column is
+appended to every row. Input is read in large chunks and output is streamed
+batch by batch, so files of any size are scanned in constant memory.
+
+For JSONL, string fields of flat rows are extracted with a regular expression
+and the verdicts are spliced into the raw line; a row is only fully parsed by
+the json module when that is not reliable (nested objects, escapes or
+repeated keys). For CSV, rows are split by the C csv reader.
+
+Run with: python -m random_string_detector.scan events.jsonl --field username:allow_numbers
+"""
+import argparse
+import contextlib
+import csv
+import io
+import json
+import re
+import sys
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, TextIO, Union
+
+from random_string_detector import bigrams
+from random_string_detector.detector import RandomStringDetector
+
+# Size of the chunks read from the input, in characters
+CHUNK_SIZE = 1 << 20
+# Number of rows scored per detector batch
+BATCH_SIZE = 4096
+
+
+def email_local_part(value: str) -> str:
+    """Get the part of an email address before the last @."""
+    return value.rpartition('@')[0] or value
+
+
+class FieldSpec(object):
+    """A field to check, with the detector settings that apply to it."""
+
+    def __init__(self, name: str, detector: Optional[RandomStringDetector] = None,
+                 threshold: float = 0.5, extract: Optional[Callable[[str], str]] = None,
+                 column: Optional[str] = None):
+        """Initialize a FieldSpec object.
+
+        Attributes:
+        - name (str): CSV column or JSON key; dotted paths (e.g. "user.name") select
+          nested JSON fields.
+        - detector (RandomStringDetector): detector for this field.
+        - threshold (float): threshold passed to the detector.
+        - extract (callable): function applied to the value before checking it,
+          e.g. email_local_part.
+        - column (str): name of the verdict column (default: "<name>_is_random").
+        """
+        self.name = name
+        self.detector = detector if detector is not None else RandomStringDetector()
+        self.threshold = threshold
+        self.extract = extract
+        self.column = column or f"{name}_is_random"
+
+    def score(self, values: Sequence[Optional[str]]) -> List[Optional[bool]]:
+        """Check a batch of field values; missing (None) values get a None verdict."""
+        present = [i for i, value in enumerate(values) if value is not None]
+        texts = [values[i] for i in present]
+        if self.extract is not None:
+            texts = [self.extract(text) for text in texts]
+        verdicts = [None] * len(values)
+        for i, verdict in zip(present, self.detector.batch(texts, self.threshold)):
+            verdicts[i] = verdict
+        return verdicts
+
+
+def _open(file: Union[str, TextIO], mode: str, stack: contextlib.ExitStack) -> TextIO:
+    """Open a path, closed with the stack; file objects of the caller are left open."""
+    if isinstance(file, str):
+        return stack.enter_context(open(file, mode, newline='', encoding='utf-8', buffering=CHUNK_SIZE))
+    return file
+
+
+def _batches(items: Iterable, size: int) -> Iterator[list]:
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _read_lines(source: TextIO, chunk_size: int) -> Iterator[str]:
+    """Split the input into lines, reading it in chunks of chunk_size characters."""
+    remainder = ''
+    while True:
+        chunk = source.read(chunk_size)
+        if not chunk:
+            break
+        lines = (remainder + chunk).split('\n')
+        remainder = lines.pop()
+        yield from lines
+    if remainder:
+        yield remainder
+
+
+def scan_csv(source: Union[str, TextIO], destination: Union[str, TextIO], fields: Sequence[FieldSpec],
+             delimiter: str = ',', batch_size: int = BATCH_SIZE) -> Dict[str, int]:
+    """Check fields of a CSV file and write it back out with verdict columns appended.
+
+    Verdict columns contain "true", "false", or an empty string for empty values.
+    Rows with fewer fields than the header are padded with empty fields; rows with
+    more fields raise a ValueError, since their verdicts would land under the
+    wrong columns.
+
+    Args:
+    - source: path or text file with a header row
+    - destination: path or text file for the output
+    - fields: fields to check
+    - delimiter: field delimiter
+    - batch_size: number of rows scored per detector batch
+
+    Returns:
+    - number of rows scanned ("rows") and of random values per verdict column
+    """
+    with contextlib.ExitStack() as stack:
+        return _scan_csv(_open(source, 'r', stack), _open(destination, 'w', stack), fields,
+                         delimiter, batch_size)
+
+
+def _scan_csv(source: TextIO, destination: TextIO, fields: Sequence[FieldSpec],
+              delimiter: str, batch_size: int) -> Dict[str, int]:
+    reader = csv.reader(source, delimiter=delimiter)
+    writer = csv.writer(destination, delimiter=delimiter, lineterminator='\n')
+
+    header = next(reader, None)
+    if header is None:
+        return {'rows': 0}
+    missing = [spec.name for spec in fields if spec.name not in header]
+    if missing:
+        raise ValueError(f"fields not in the CSV header: {', '.join(missing)}")
+    indices = [header.index(spec.name) for spec in fields]
+    writer.writerow(header + [spec.column for spec in fields])
+
+    counts = {'rows': 0}
+    counts.update((spec.column, 0) for spec in fields)
+    for rows in _batches(_check_widths(reader, len(header)), batch_size):
+        columns = []
+        for spec, index in zip(fields, indices):
+            verdicts = spec.score([row[index] if index < len(row) and row[index] else None
+                                   for row in rows])
+            counts[spec.column] += sum(1 for verdict in verdicts if verdict)
+            columns.append(['' if verdict is None else 'true' if verdict else 'false'
+                            for verdict in verdicts])
+        # Short rows are padded, so that verdicts land in their own columns
+        padding = [[''] * n for n in range(len(header) + 1)]
+        writer.writerows(row + padding[max(len(header) - len(row), 0)] + list(verdicts)
+                         for row, *verdicts in zip(rows, *columns))
+        counts['rows'] += len(rows)
+    destination.flush()
+    return counts
+
+
+def _check_widths(reader, width: int) -> Iterator[List[str]]:
+    """Yield the rows of a CSV reader, raising ValueError on rows wider than the header."""
+    for row in reader:
+        if len(row) > width:
+            raise ValueError(f"line {reader.line_num}: {len(row)} fields, but the header has {width}")
+        yield row
+
+
+def _field_pattern(name: str) -> "re.Pattern":
+    """Regular expression for a top-level-looking "name": "value" pair."""
+    return re.compile(r'"%s"\s*:\s*"((?:[^"\\]|\\.)*)"' % re.escape(name))
+
+
+def _get_path(record, path: List[str]) -> Optional[str]:
+    for key in path:
+        if not isinstance(record, dict) or key not in record:
+            return None
+        record = record[key]
+    return record if isinstance(record, str) and record else None
+
+
+def scan_jsonl(source: Union[str, TextIO], destination: Union[str, TextIO], fields: Sequence[FieldSpec],
+               chunk_size: int = CHUNK_SIZE, batch_size: int = BATCH_SIZE) -> Dict[str, int]:
+    """Check fields of a JSONL file and write it back out with verdict keys added.
+
+    Verdict keys are JSON booleans, or null for missing and empty values. Blank
+    lines are copied through unchanged.
+
+    Args:
+    - source: path or text file with one JSON object per line
+    - destination: path or text file for the output
+    - fields: fields to check
+    - chunk_size: size of the chunks read from the input, in characters
+    - batch_size: number of rows scored per detector batch
+
+    Returns:
+    - number of rows scanned ("rows") and of random values per verdict key
+    """
+    with contextlib.ExitStack() as stack:
+        return _scan_jsonl(_open(source, 'r', stack), _open(destination, 'w', stack), fields,
+                           chunk_size, batch_size)
+
+
+def _scan_jsonl(source: TextIO, destination: TextIO, fields: Sequence[FieldSpec],
+                chunk_size: int, batch_size: int) -> Dict[str, int]:
+    patterns = [_field_pattern(spec.name) if '.' not in spec.name else None for spec in fields]
+    paths = [spec.name.split('.') for spec in fields]
+
+    counts = {'rows': 0}
+    counts.update((spec.column, 0) for spec in fields)
+    for lines in _batches(_read_lines(source, chunk_size), batch_size):
+        values = [[None] * len(lines) for _ in fields]
+        for row, line in enumerate(lines):
+            if not line.strip():
+                continue
+            # Without nested objects or escapes, a "key": "value" match can only be
+            # a top-level string field
+            flat = line.count('{') == 1 and '\\' not in line
+            record = None
+            for f, pattern in enumerate(patterns):
+                if flat and pattern is not None:
+                    matches = pattern.findall(line)
+                    if len(matches) <= 1:
+                        values[f][row] = (matches[0] or None) if matches else None
+                        continue
+                # Nested path, nested objects, escapes or repeated key: parse the row
+                if record is None:
+                    record = json.loads(line)
+                values[f][row] = _get_path(record, paths[f])
+
+        verdicts = []
+        for spec, field_values in zip(fields, values):
+            field_verdicts = spec.score(field_values)
+            counts[spec.column] += sum(1 for verdict in field_verdicts if verdict)
+            verdicts.append(field_verdicts)
+
+        output = []
+        for row, line in enumerate(lines):
+            stripped = line.rstrip()
+            if not stripped:
+                output.append(line + '\n')
+                continue
+            if not stripped.endswith('}'):
+                raise ValueError(f"not a JSON object: {stripped[:80]!r}")
+            added = ', '.join(f'{json.dumps(spec.column)}: {json.dumps(field_verdicts[row])}'
+                              for spec, field_verdicts in zip(fields, verdicts))
+            body = stripped[:-1].rstrip()
+            separator = '' if body.endswith('{') else ', '
+            output.append(f"{body}{separator}{added}}}\n")
+            counts['rows'] += 1
+        destination.write(''.join(output))
+    destination.flush()
+    return counts
+
+
+def parse_field(argument: str) -> FieldSpec:
+    """Parse a --field argument: name[:option,...].
+
+    Options: allow_numbers, email (check the local part of an email address),
+    threshold=<float>, table=<english|portuguese_without_accents|french_without_accents>.
+    """
+    name, _, options = argument.partition(':')
+    kwargs = {}
+    threshold = 0.5
+    extract = None
+    for option in filter(None, options.split(',')):
+        key, _, value = option.partition('=')
+        if key == 'allow_numbers':
+            kwargs['allow_numbers'] = True
+        elif key == 'email':
+            extract = email_local_part
+        elif key == 'threshold':
+            threshold = float(value)
+        elif key == 'table':
+            kwargs['bigrams_probs'] = getattr(bigrams, value.upper())
+        else:
+            raise ValueError(f"unknown field option: {option}")
+    return FieldSpec(name, RandomStringDetector(**kwargs), threshold, extract)
+
+
+def main(argv: Optional[List[str]] = None):
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="Check fields of CSV or JSONL files for random strings.")
+    parser.add_argument('input', help="input file, or - for stdin")
+    parser.add_argument('--field', action='append', required=True, type=parse_field,
+                        help="field to check, as name[:option,...], e.g. username:allow_numbers "
+                             "or email:email (options: allow_numbers, email, threshold=X, table=NAME)")
+    parser.add_argument('--format', choices=['csv', 'jsonl'], help="default: from the file extension")
+    parser.add_argument('-o', '--output', default='-', help="output file (default: stdout)")
+    parser.add_argument('--delimiter', default=',', help="CSV delimiter")
+    args = parser.parse_args(argv)
+
+    file_format = args.format or ('csv' if args.input.endswith('.csv') else 'jsonl')
+    source = io.TextIOWrapper(sys.stdin.buffer, encoding='utf-8', newline='') \
+        if args.input == '-' else args.input
+    destination = sys.stdout if args.output == '-' else args.output
+    if file_format == 'csv':
+        counts = scan_csv(source, destination, args.field, delimiter=args.delimiter)
+    else:
+        counts = scan_jsonl(source, destination, args.field)
+    print(json.dumps(counts), file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,123 @@
+"""Compact pickling of RandomStringDetector, e.g. for process pools.
+
+A pickled detector refers to bundled bigram tables and keyboard layouts by name,
+to shared memory blocks by their block name, and carries custom bigram tables as
+compressed binary. Workers rebuild the compiled state once per configuration and
+reuse the (immutable) detector for later tasks with the same configuration.
+"""
+import struct
+import zlib
+from types import MappingProxyType
+from typing import Mapping, Tuple
+
+from random_string_detector import bigrams as bundled_bigrams
+from random_string_detector.shared import SharedBigramTable
+
+_ENTRY = struct.Struct('<Hd')  # key size, probability
+
+# Detectors rebuilt in this process, by pickled state
+_RESTORED = {}
+_MAX_RESTORED = 64
+
+
+def pack_table(table: Mapping[str, float]) -> bytes:
+    """Encode a bigram table as compressed binary.
+
+    Args:
+    - table: bigram table
+
+    Returns:
+    - bytes that unpack_table() decodes back into the table
+    """
+    packed = bytearray()
+    for key, prob in table.items():
+        encoded = key.encode('utf-8', 'surrogatepass')
+        packed += _ENTRY.pack(len(encoded), prob) + encoded
+    return zlib.compress(bytes(packed), 9)
+
+
+def unpack_table(data: bytes) -> MappingProxyType:
+    """Decode a bigram table encoded by pack_table().
+
+    Args:
+    - data: encoded table
+
+    Returns:
+    - the bigram table, as a read-only mapping
+    """
+    packed = zlib.decompress(data)
+    table = {}
+    offset = 0
+    while offset < len(packed):
+        size, prob = _ENTRY.unpack_from(packed, offset)
+        offset += _ENTRY.size
+        table[packed[offset:offset + size].decode('utf-8', 'surrogatepass')] = prob
+        offset += size
+    return MappingProxyType(table)
+
+
+def table_reference(table: Mapping[str, float]) -> Tuple:
+    """Get a compact, hashable reference to a bigram table for pickling.
+
+    Args:
+    - table: bigram table
+
+    Returns:
+    - ('bundled', name) for the tables in random_string_detector.bigrams,
+      ('shared', table) for a SharedBigramTable (which pickles as its block name),
+      or ('packed', bytes) for any other table
+    """
+    # Only tables already loaded can be the given table
+    loaded = vars(bundled_bigrams)
+    for name in bundled_bigrams.TABLES:
+        if loaded.get(name) is table:
+            return ('bundled', name)
+    if isinstance(table, SharedBigramTable):
+        return ('shared', table)
+    return ('packed', pack_table(table))
+
+
+def resolve_table(reference: Tuple) -> Mapping[str, float]:
+    """Get the bigram table for a reference made by table_reference()."""
+    kind, value = reference
+    if kind == 'bundled':
+        return getattr(bundled_bigrams, value)
+    if kind == 'shared':
+        return value
+    return unpack_table(value)
+
+
+def restore_detector(cls, table: Tuple, common_bigrams_threshold: float,
+                     uncommon_bigrams_threshold: float, duplicated_bigrams_threshold: float,
+                     allow_numbers: bool, keyboard_layout, cache,
+                     limits: Tuple = (None, None, None)):
+    """Rebuild a pickled detector, reusing an identical one restored earlier.
+
+    Detectors are immutable, so a worker can hand the same instance to every task
+    that sends the same configuration, and only compiles it once.
+    """
+    key = (cls, table, common_bigrams_threshold, uncommon_bigrams_threshold,
+           duplicated_bigrams_threshold, allow_numbers, keyboard_layout, cache, limits)
+    try:
+        return _RESTORED[key]
+    except KeyError:
+        pass
+    except TypeError:  # unhashable cache or table object
+        key = None
+
+    max_token_length, max_tokens, time_budget = limits
+    detector = cls(
+        bigrams_probs=resolve_table(table),
+        common_bigrams_threshold=common_bigrams_threshold,
+        uncommon_bigrams_threshold=uncommon_bigrams_threshold,
+        duplicated_bigrams_threshold=duplicated_bigrams_threshold,
+        allow_numbers=allow_numbers,
+        keyboard_layout=keyboard_layout,
+        max_token_length=max_token_length,
+        max_tokens=max_tokens,
+        time_budget=time_budget,
+        cache=cache,
+    )
+    if key is not None and len(_RESTORED) < _MAX_RESTORED:
+        _RESTORED[key] = detector
+    return detector
@@ -0,0 +1,371 @@
+"""Local HTTP detection service built on asyncio, with no external dependency.
+
+Endpoints:
+- POST /detect  {"text": "...", "threshold": 0.5}        -> {"random": true}
+- POST /batch   {"texts": ["...", ...], "threshold": 0.5} -> {"results": [true, ...]}
+- GET  /stats   request counts and latency histograms per endpoint
+- GET  /health  -> {"status": "ok"}
+- GET  /metrics detector metrics in Prometheus text format, if the detector has
+  metrics (see random_string_detector.metrics)
+
+Texts from concurrent requests are coalesced into batches for the detector:
+the batcher waits at most `max_delay` seconds (or until `max_batch` texts are
+queued) and scores the batch on a worker thread, so the event loop keeps
+accepting requests meanwhile. Connections are kept alive (HTTP/1.1).
+
+Run with: python -m random_string_detector.server --port 8080
+"""
+import argparse
+import asyncio
+import bisect
+import json
+import threading
+import time
+from http import HTTPStatus
+from typing import Dict, List, Optional, Tuple
+
+from random_string_detector import bigrams
+from random_string_detector.detector import RandomStringDetector
+from random_string_detector.metrics import DetectorMetrics
+
+# Upper bounds of the latency histogram buckets, in seconds
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, float('inf'))
+
+# Paths with their own latency histogram; other requests are recorded under 'other'
+ENDPOINTS = ('/detect', '/batch', '/stats', '/health', '/metrics')
+
+
+class LatencyHistogram(object):
+    """Cumulative histogram of request latencies."""
+
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        """Initialize a LatencyHistogram object.
+
+        Attributes:
+        - buckets (tuple): upper bounds of the buckets, in seconds.
+        - counts (list): number of observations in each bucket.
+        - count (int): total number of observations.
+        - total (float): sum of the observations, in seconds.
+        """
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, seconds: float):
+        """Record one latency."""
+        self.counts[bisect.bisect_left(self.buckets, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+
+    def to_dict(self) -> Dict[str, object]:
+        """Summarize the histogram as a JSON-serializable dictionary."""
+        return {
+            'count': self.count,
+            'mean_ms': 1000 * self.total / self.count if self.count else 0.0,
+            'buckets_ms': {('+Inf' if b == float('inf') else f'{1000 * b:g}'): c
+                           for b, c in zip(self.buckets, self.counts)},
+        }
+
+
+class _BadRequest(Exception):
+    """Raised for requests that cannot be served, with the HTTP status to return."""
+
+    def __init__(self, status: HTTPStatus, message: str = ''):
+        super().__init__(message or status.phrase)
+        self.status = status
+
+
+class DetectionServer(object):
+    """HTTP server exposing a RandomStringDetector, with request coalescing."""
+
+    def __init__(self, detector: RandomStringDetector, host: str = '127.0.0.1', port: int = 8080,
+                 max_batch: int = 512, max_delay: float = 0.002, max_body: int = 1 << 20):
+        """Initialize a DetectionServer object.
+
+        Attributes:
+        - detector (RandomStringDetector): detector scoring the texts.
+        - host (str): address to listen on.
+        - port (int): port to listen on (0 picks a free port, set once started).
+        - max_batch (int): maximum number of texts scored in one batch.
+        - max_delay (float): maximum time a text waits for its batch to fill, in seconds.
+        - max_body (int): maximum size of a request body, in bytes.
+        - latencies (dict): LatencyHistogram of each endpoint.
+        - batches (int): number of batches scored.
+        - batched_texts (int): number of texts scored in batches.
+        """
+        self.detector = detector
+        self.host = host
+        self.port = port
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.max_body = max_body
+        self.latencies = {}
+        self.batches = 0
+        self.batched_texts = 0
+        self._server = None
+        self._connections = set()
+        self._queue = None
+        self._batcher = None
+        self._thread = None
+        self._loop = None
+
+    # Request coalescing
+
+    async def _score(self, texts: List[str], threshold: float) -> List[bool]:
+        """Queue texts for the next batch and wait for their verdicts."""
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((texts, threshold, future))
+        return await future
+
+    async def _run_batcher(self):
+        """Collect queued texts into batches and score them on a worker thread."""
+        loop = asyncio.get_running_loop()
+        while True:
+            pending = [await self._queue.get()]
+            size = len(pending[0][0])
+            deadline = loop.time() + self.max_delay
+            while size < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                pending.append(item)
+                size += len(item[0])
+
+            try:
+                results = await loop.run_in_executor(None, self._score_batch, pending)
+            except Exception as error:
+                for _, _, future in pending:
+                    if not future.done():
+                        future.set_exception(error)
+                continue
+            for (_, _, future), verdicts in zip(pending, results):
+                if not future.done():
+                    future.set_result(verdicts)
+
+    def _score_batch(self, pending) -> List[List[bool]]:
+        """Score coalesced requests, in one detector batch per threshold."""
+        by_threshold = {}
+        for texts, threshold, _ in pending:
+            by_threshold.setdefault(threshold, []).extend(texts)
+        verdicts = {threshold: iter(self.detector.batch(texts, threshold))
+                    for threshold, texts in by_threshold.items()}
+        self.batches += 1
+        self.batched_texts += sum(len(texts) for texts, _, _ in pending)
+        return [[next(verdicts[threshold]) for _ in texts] for texts, threshold, _ in pending]
+
+    # HTTP
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Serve requests on one connection until the client closes it."""
+        task = asyncio.current_task()
+        self._connections.add(task)
+        try:
+            while True:
+                try:
+                    request_line = await self._read_head_line(reader)
+                    if not request_line:
+                        break
+                    start = time.perf_counter()
+                    try:
+                        method, path, version = request_line.decode('latin-1').split()
+                    except ValueError:
+                        raise _BadRequest(HTTPStatus.BAD_REQUEST, 'malformed request line')
+
+                    headers = {}
+                    while True:
+                        line = await self._read_head_line(reader)
+                        if line in (b'\r\n', b'\n', b''):
+                            break
+                        name, _, value = line.decode('latin-1').partition(':')
+                        headers[name.strip().lower()] = value.strip()
+                except _BadRequest as error:
+                    await self._respond(writer, error.status, {'error': str(error)}, False)
+                    break
+
+                connection = headers.get('connection', '').lower()
+                keep_alive = connection != 'close' if version == 'HTTP/1.1' else connection == 'keep-alive'
+
+                try:
+                    length = int(headers.get('content-length', 0))
+                    if length > self.max_body:
+                        keep_alive = False
+                        raise _BadRequest(HTTPStatus.REQUEST_ENTITY_TOO_LARGE)
+                    body = await reader.readexactly(length) if length else b''
+                    status, payload = HTTPStatus.OK, await self._route(method, path, body)
+                except _BadRequest as error:
+                    status, payload = error.status, {'error': str(error)}
+                except ValueError:
+                    status, payload = HTTPStatus.BAD_REQUEST, {'error': 'invalid Content-Length'}
+                    keep_alive = False
+
+                await self._respond(writer, status, payload, keep_alive)
+                endpoint = path if path in ENDPOINTS and status != HTTPStatus.NOT_FOUND else 'other'
+                self.latencies.setdefault(endpoint, LatencyHistogram()).observe(time.perf_counter() - start)
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        except asyncio.CancelledError:
+            # Server shutdown; ending the handler normally keeps asyncio from
+            # reporting the cancelled connection task as an error
+            pass
+        finally:
+            self._connections.discard(task)
+            writer.close()
+
+    async def _route(self, method: str, path: str, body: bytes):
+        """Dispatch a request to its endpoint and get the JSON payload to return."""
+        if path == '/health':
+            self._check_method(method, 'GET')
+            return {'status': 'ok'}
+        if path == '/stats':
+            self._check_method(method, 'GET')
+            return self.stats()
+        if path == '/metrics' and self.detector.metrics is not None:
+            self._check_method(method, 'GET')
+            return self.detector.metrics.registry.render()
+        if path in ('/detect', '/batch'):
+            self._check_method(method, 'POST')
+            try:
+                request = json.loads(body)
+                threshold = float(request.get('threshold', 0.5))
+                texts = [request['text']] if path == '/detect' else request['texts']
+            except (ValueError, TypeError, KeyError, AttributeError):
+                raise _BadRequest(HTTPStatus.BAD_REQUEST, 'expected a JSON object with '
+                                  + ('"text"' if path == '/detect' else '"texts"'))
+            if not isinstance(texts, list) or not all(isinstance(text, str) for text in texts):
+                raise _BadRequest(HTTPStatus.BAD_REQUEST, 'texts must be strings')
+            try:
+                verdicts = await self._score(texts, threshold) if texts else []
+            except Exception as error:
+                raise _BadRequest(HTTPStatus.INTERNAL_SERVER_ERROR, f'detector failed: {type(error).__name__}')
+            return {'random': verdicts[0]} if path == '/detect' else {'results': verdicts}
+        raise _BadRequest(HTTPStatus.NOT_FOUND)
+
+    @staticmethod
+    async def _read_head_line(reader: asyncio.StreamReader) -> bytes:
+        """Read a line of the request line or headers, which must fit in the reader's limit."""
+        try:
+            return await reader.readline()
+        except ValueError:
+            # readline() reports a line over the limit (LimitOverrunError) as a ValueError
+            raise _BadRequest(HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE, 'request line or header too long')
+
+    @staticmethod
+    def _check_method(method: str, allowed: str):
+        if method != allowed:
+            raise _BadRequest(HTTPStatus.METHOD_NOT_ALLOWED)
+
+    @staticmethod
+    async def _respond(writer: asyncio.StreamWriter, status: HTTPStatus, payload, keep_alive: bool):
+        """Write a JSON response, or a text response for string payloads."""
+        if isinstance(payload, str):
+            body, content_type = payload.encode(), 'text/plain; version=0.0.4; charset=utf-8'
+        else:
+            body, content_type = json.dumps(payload).encode(), 'application/json'
+        writer.write(
+            f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+            f"Content-Type: {content_type}\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode('latin-1') + body)
+        await writer.drain()
+
+    def stats(self) -> Dict[str, object]:
+        """Get request counts, latency histograms and batching statistics."""
+        return {
+            'latency': {endpoint: histogram.to_dict() for endpoint, histogram in self.latencies.items()},
+            'batches': self.batches,
+            'mean_batch_size': self.batched_texts / self.batches if self.batches else 0.0,
+        }
+
+    # Lifecycle
+
+    async def start(self):
+        """Start listening and batching; sets port if it was 0."""
+        self._queue = asyncio.Queue()
+        self._batcher = asyncio.ensure_future(self._run_batcher())
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def close(self):
+        """Stop listening, close kept-alive connections and stop batching."""
+        self._server.close()
+        tasks = list(self._connections) + [self._batcher]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await self._server.wait_closed()
+
+    async def serve_forever(self):
+        """Start the server and serve until cancelled."""
+        await self.start()
+        try:
+            await self._server.serve_forever()
+        finally:
+            await self.close()
+
+    def start_in_thread(self) -> "DetectionServer":
+        """Run the server on an event loop in a background thread, e.g. for tests.
+
+        Returns:
+        - the server, once it is listening
+        """
+        started = threading.Event()
+
+        def run():
+            self._loop = asyncio.new_event_loop()
+            self._loop.run_until_complete(self.start())
+            started.set()
+            self._loop.run_forever()
+            self._loop.run_until_complete(self.close())
+            self._loop.close()
+
+        self._thread = threading.Thread(target=run, name='random-string-detector-server', daemon=True)
+        self._thread.start()
+        started.wait()
+        return self
+
+    def stop(self):
+        """Stop a server started with start_in_thread()."""
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+
+    def __enter__(self):
+        return self.start_in_thread()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+def main(argv: Optional[List[str]] = None):
+    """Command line entry point."""
+    tables = {name.lower(): name for name in bigrams.TABLES}
+    parser = argparse.ArgumentParser(description="Serve RandomStringDetector over HTTP.")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--table', choices=sorted(tables), default='english', help="bigram table")
+    parser.add_argument('--allow-numbers', action='store_true')
+    parser.add_argument('--max-batch', type=int, default=512, help="maximum texts per scored batch")
+    parser.add_argument('--max-delay', type=float, default=0.002,
+                        help="maximum seconds a text waits for its batch to fill")
+    parser.add_argument('--metrics', action='store_true', help="serve detector metrics on /metrics")
+    args = parser.parse_args(argv)
+
+    metrics = DetectorMetrics(name=args.table) if args.metrics else None
+    detector = RandomStringDetector(bigrams_probs=getattr(bigrams, tables[args.table]),
+                                    allow_numbers=args.allow_numbers, metrics=metrics)
+    server = DetectionServer(detector, args.host, args.port, args.max_batch, args.max_delay)
+    print(f"Serving on http://{args.host}:{args.port}")
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,324 @@
+"""Bigram tables and verdict caches in shared memory.
+
+A SharedBigramTable places a bigram table in a multiprocessing.shared_memory
+block, so that any number of worker processes attach to one read-only buffer
+instead of each holding its own copy. Detectors still compile a private rank
+index from the table (see compiled.CompiledTable), of about 80KB, because
+ranks read from shared memory made is_random_word markedly slower for a
+negligible share of a worker's memory. A SharedVerdictCache is a fixed-size,
+lock-free verdict cache in shared memory that all workers read and fill.
+
+The process that creates a block owns it and must unlink it when done (use
+the objects as context managers); workers only attach and close.
+"""
+import hashlib
+import struct
+import sys
+import threading
+from collections.abc import Mapping
+from multiprocessing import resource_tracker, shared_memory
+from typing import Dict, Iterator, Optional
+
+# Bigrams of two ASCII characters are stored in a dense 128 x 128 array of
+# float64, with NaN marking missing bigrams; any other keys, and bigrams whose
+# probability is NaN, go in an overflow area
+_DENSE_SIZE = 128 * 128
+_MISSING = float('nan')
+_DENSE = struct.Struct(f'<{_DENSE_SIZE}d')
+_DOUBLE = struct.Struct('<d')
+_SLOT = struct.Struct('<Q')
+
+_TABLE_MAGIC = b'RSDT'
+_TABLE_HEADER = struct.Struct('<4sII4x')  # magic, number of entries, overflow size
+_CACHE_MAGIC = b'RSDC'
+# magic, log2 of slots, fingerprint; 24 bytes, so the 8-byte slots stay aligned
+_CACHE_HEADER = struct.Struct('<4sI16s')
+
+
+_ATTACH_LOCK = threading.Lock()
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    """Attach to an existing shared memory block without taking ownership of it."""
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+    # Before 3.13 attaching registers the block with the resource tracker, which
+    # would unlink it when this process exits, under the feet of the owner. The
+    # registration is patched out process-wide, so attaches are serialized.
+    with _ATTACH_LOCK:
+        register = resource_tracker.register
+        resource_tracker.register = lambda name, rtype: None
+        try:
+            return shared_memory.SharedMemory(name=name)
+        finally:
+            resource_tracker.register = register
+
+
+def word_hash(word: str) -> int:
+    """Stable unsigned 64-bit hash of a word, for caches shared between processes and runs.
+
+    The built-in hash() of strings is randomized per process, so it cannot be used.
+    """
+    return int.from_bytes(hashlib.blake2b(
+        word.encode('utf-8', 'surrogatepass'), digest_size=8).digest(), 'little')
+
+
+# Blocks attached by unpickling in this process, by class and name
+_ATTACHED = {}
+
+
+def _attach_once(cls, name: str):
+    """Attach to a shared block once per process, for unpickling."""
+    try:
+        return _ATTACHED[cls, name]
+    except KeyError:
+        return _ATTACHED.setdefault((cls, name), cls.attach(name))
+
+
+def _dense_index(key: str) -> int:
+    """Get the index of a key in the dense array, or -1 if it is not stored there."""
+    if len(key) == 2:
+        a = ord(key[0])
+        b = ord(key[1])
+        if a < 128 and b < 128:
+            return a * 128 + b
+    return -1
+
+
+class SharedBigramTable(Mapping):
+    """Read-only bigram table stored in shared memory.
+
+    Use SharedBigramTable.create() in the parent process and pass the table (or
+    its name, for SharedBigramTable.attach()) to the workers. It can be used
+    anywhere a bigram dictionary is accepted, e.g. as bigrams_probs of a
+    RandomStringDetector.
+    """
+
+    def __init__(self, shm: shared_memory.SharedMemory, owner: bool = False):
+        """Initialize a SharedBigramTable from a shared memory block.
+
+        Attributes:
+        - name (str): name of the shared memory block.
+        - owner (bool): whether this process created the block and unlinks it.
+        """
+        magic, size, overflow_size = _TABLE_HEADER.unpack_from(shm.buf)
+        if magic != _TABLE_MAGIC:
+            raise ValueError(f"shared memory block {shm.name!r} is not a bigram table")
+        self._shm = shm
+        self.name = shm.name
+        self.owner = owner
+        self._size = size
+        offset = _TABLE_HEADER.size
+        # Values are read with struct rather than through a cast view, which would
+        # keep the block from being closed while the view is alive
+        self._buf = shm.buf
+        self._dense_offset = offset
+        offset += 8 * _DENSE_SIZE
+        # Keys that do not fit the dense array are few, if any: keep them in a local dict
+        self._overflow = {}
+        end = offset + overflow_size
+        while offset < end:
+            key_size, prob = struct.unpack_from('<Id', shm.buf, offset)
+            offset += 12
+            self._overflow[bytes(shm.buf[offset:offset + key_size]).decode('utf-8')] = prob
+            offset += key_size
+
+    @classmethod
+    def create(cls, bigrams: Mapping, name: Optional[str] = None) -> "SharedBigramTable":
+        """Copy a bigram table into a new shared memory block.
+
+        Args:
+        - bigrams: bigram table, e.g. ENGLISH
+        - name: name of the block (random if omitted)
+
+        Returns:
+        - a SharedBigramTable that owns the block
+        """
+        overflow = bytearray()
+        dense = [_MISSING] * _DENSE_SIZE
+        for key, prob in bigrams.items():
+            index = _dense_index(key)
+            # NaN would read as missing in the dense array, while a dict keeps the entry
+            if index >= 0 and prob == prob:
+                dense[index] = float(prob)
+            else:
+                encoded = key.encode('utf-8')
+                overflow += struct.pack('<Id', len(encoded), prob) + encoded
+
+        header = _TABLE_HEADER.pack(_TABLE_MAGIC, len(bigrams), len(overflow))
+        size = len(header) + 8 * _DENSE_SIZE + len(overflow)
+        shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        shm.buf[:len(header)] = header
+        _DENSE.pack_into(shm.buf, len(header), *dense)
+        shm.buf[len(header) + 8 * _DENSE_SIZE:size] = overflow
+        return cls(shm, owner=True)
+
+    @classmethod
+    def attach(cls, name: str) -> "SharedBigramTable":
+        """Attach to a bigram table created by another process.
+
+        Args:
+        - name: name of the shared memory block
+
+        Returns:
+        - a SharedBigramTable that does not own the block
+        """
+        return cls(_attach(name))
+
+    def __reduce__(self):
+        """Pickle as the block name; unpickling attaches to the block once per process."""
+        return (_attach_once, (SharedBigramTable, self.name))
+
+    def get(self, key, default=None):
+        index = _dense_index(key)
+        if index < 0:
+            return self._overflow.get(key, default)
+        prob = _DOUBLE.unpack_from(self._buf, self._dense_offset + 8 * index)[0]
+        if prob != prob:
+            # Missing, or stored in the overflow area with a NaN probability
+            return self._overflow.get(key, default)
+        return prob
+
+    def __getitem__(self, key):
+        prob = self.get(key, _MISSING)
+        if prob is _MISSING:
+            raise KeyError(key)
+        return prob
+
+    def __contains__(self, key):
+        return self.get(key, _MISSING) is not _MISSING
+
+    def __iter__(self) -> Iterator[str]:
+        dense = _DENSE.unpack_from(self._buf, self._dense_offset)
+        for index, prob in enumerate(dense):
+            if prob == prob:
+                yield chr(index // 128) + chr(index % 128)
+        yield from self._overflow
+
+    def __len__(self):
+        return self._size
+
+    def close(self):
+        """Detach from the shared memory block, and unlink it if this process owns it."""
+        if self._buf is None:
+            return
+        self._buf = None
+        self._shm.close()
+        if self.owner:
+            self._shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __repr__(self):
+        return f"SharedBigramTable({self.name!r}, {self._size} bigrams)"
+
+
+class SharedVerdictCache(object):
+    """Fixed-size verdict cache in shared memory, bound to one detector configuration.
+
+    The cache is a direct-mapped table of 64-bit slots indexed by a hash of the
+    word. Each slot stores the upper bits of the hash, the verdict and a valid bit,
+    written with a single aligned 8-byte store, so processes read and fill it
+    without locks. Colliding words simply evict each other.
+
+    Pass it as the cache of a RandomStringDetector with the same fingerprint.
+    """
+
+    def __init__(self, shm: shared_memory.SharedMemory, owner: bool = False):
+        """Initialize a SharedVerdictCache from a shared memory block.
+
+        Attributes:
+        - name (str): name of the shared memory block.
+        - owner (bool): whether this process created the block and unlinks it.
+        - fingerprint (bytes): fingerprint of the detector configuration.
+        - hits (int): number of lookups answered by the cache in this process.
+        - misses (int): number of lookups not answered by the cache in this process.
+        """
+        magic, log2_slots, fingerprint = _CACHE_HEADER.unpack_from(shm.buf)
+        if magic != _CACHE_MAGIC:
+            raise ValueError(f"shared memory block {shm.name!r} is not a verdict cache")
+        self._shm = shm
+        self.name = shm.name
+        self.owner = owner
+        self.fingerprint = fingerprint
+        self._mask = (1 << log2_slots) - 1
+        self._buf = shm.buf
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def create(cls, fingerprint: bytes, slots: int = 1 << 20,
+               name: Optional[str] = None) -> "SharedVerdictCache":
+        """Create an empty verdict cache in a new shared memory block.
+
+        Args:
+        - fingerprint: fingerprint of the detector configuration (detector.fingerprint)
+        - slots: number of slots, rounded up to a power of two (8 bytes each)
+        - name: name of the block (random if omitted)
+
+        Returns:
+        - a SharedVerdictCache that owns the block
+        """
+        log2_slots = max(slots - 1, 1).bit_length()
+        shm = shared_memory.SharedMemory(
+            name=name, create=True, size=_CACHE_HEADER.size + (8 << log2_slots))
+        _CACHE_HEADER.pack_into(shm.buf, 0, _CACHE_MAGIC, log2_slots, fingerprint)
+        return cls(shm, owner=True)
+
+    @classmethod
+    def attach(cls, name: str) -> "SharedVerdictCache":
+        """Attach to a verdict cache created by another process.
+
+        Args:
+        - name: name of the shared memory block
+
+        Returns:
+        - a SharedVerdictCache that does not own the block
+        """
+        return cls(_attach(name))
+
+    def __reduce__(self):
+        """Pickle as the block name; unpickling attaches to the block once per process."""
+        return (_attach_once, (SharedVerdictCache, self.name))
+
+    def get(self, word: str) -> Optional[bool]:
+        """Get the cached verdict for a word, or None if it is not cached."""
+        key = word_hash(word)
+        entry = _SLOT.unpack_from(self._buf, _CACHE_HEADER.size + 8 * (key & self._mask))[0]
+        if entry & 1 and entry >> 2 == key >> 2:
+            self.hits += 1
+            return bool(entry & 2)
+        self.misses += 1
+        return None
+
+    def set(self, word: str, verdict: bool):
+        """Cache the verdict for a word."""
+        key = word_hash(word)
+        _SLOT.pack_into(self._buf, _CACHE_HEADER.size + 8 * (key & self._mask),
+                        (key >> 2 << 2) | (2 if verdict else 0) | 1)
+
+    def stats(self) -> Dict[str, int]:
+        """Get the hit and miss counts of this process."""
+        return {'hits': self.hits, 'misses': self.misses}
+
+    def close(self):
+        """Detach from the shared memory block, and unlink it if this process owns it."""
+        if self._buf is None:
+            return
+        self._buf = None
+        self._shm.close()
+        if self.owner:
+            self._shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __repr__(self):
+        return f"SharedVerdictCache({self.name!r}, {self._mask + 1} slots)"
@@ -0,0 +1,183 @@
+"""Persistent verdict store shared across runs, backed by sqlite.
+
+A VerdictStore is a verdict cache for RandomStringDetector that lives in a
+sqlite file. Verdicts are keyed by the detector's fingerprint (thresholds,
+allow_numbers, table contents and keyboard layout) and a hash of the word, so
+a store opened for another configuration does not see them, and detectors with
+different configurations can share one file without overwriting each other.
+
+By default the store is loaded into memory when opened, so lookups cost a dict
+access; new verdicts are buffered and written back in bulk on flush() or close().
+The file is opened in WAL mode, so that pool workers writing back their verdicts
+do not block each other's reads, and a worker unpickling many tasks that carry
+the same store opens (and warm-loads) it only once.
+"""
+import os
+import sqlite3
+import threading
+from multiprocessing import util
+from typing import Dict, Optional
+
+from random_string_detector.shared import word_hash
+
+# Number of new verdicts buffered before they are written back
+FLUSH_EVERY = 10000
+
+# Seconds a write waits for another connection to release the file
+BUSY_TIMEOUT = 30.0
+
+# Stores opened by unpickling, by (process id, path, fingerprint, warm)
+_OPENED = {}
+_OPENED_LOCK = threading.Lock()
+
+
+def _signed(key: int) -> int:
+    """Map an unsigned 64-bit hash to sqlite's signed 64-bit integers."""
+    return key - (1 << 64) if key >= 1 << 63 else key
+
+
+def _open_once(path: str, fingerprint: bytes, warm: bool) -> "VerdictStore":
+    """Open a verdict store once per process, for unpickling."""
+    # Keyed by process id too: a forked child must not share its parent's connection
+    key = (os.getpid(), path, fingerprint, warm)
+    with _OPENED_LOCK:
+        store = _OPENED.get(key)
+        if store is None or not store._finalizer.still_active():
+            store = _OPENED[key] = VerdictStore(path, fingerprint, warm)
+        return store
+
+
+def _migrate(connection: sqlite3.Connection):
+    """Move the verdicts of a file written with one fingerprint per file into config_verdicts."""
+    tables = {name for name, in connection.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    if 'verdicts' not in tables or 'meta' not in tables:
+        return
+    row = connection.execute("SELECT value FROM meta WHERE key = 'fingerprint'").fetchone()
+    if row is not None:
+        connection.execute("INSERT OR IGNORE INTO config_verdicts SELECT ?, word_hash, verdict FROM verdicts",
+                           (row[0],))
+    connection.execute("DROP TABLE verdicts")
+    connection.execute("DROP TABLE meta")
+
+
+class VerdictStore(object):
+    """Verdict cache persisted in a sqlite file, keyed by configuration and word."""
+
+    def __init__(self, path: str, fingerprint: bytes, warm: bool = True):
+        """Open (or create) a verdict store.
+
+        Attributes:
+        - path (str): path of the sqlite file.
+        - fingerprint (bytes): fingerprint of the detector configuration; only
+          verdicts stored with this fingerprint are read.
+        - warm (bool): whether all stored verdicts of the configuration are loaded
+          into memory on open; otherwise lookups query the file.
+        - hits (int): number of lookups answered by the store.
+        - misses (int): number of lookups not answered by the store.
+        """
+        self.path = path
+        self.fingerprint = fingerprint
+        self.warm = warm
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._pending = {}
+        self._connection = sqlite3.connect(path, timeout=BUSY_TIMEOUT, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        with self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS config_verdicts (fingerprint BLOB, word_hash INTEGER, "
+                "verdict INTEGER, PRIMARY KEY (fingerprint, word_hash)) WITHOUT ROWID")
+            _migrate(self._connection)
+        self._verdicts = {}
+        if warm:
+            self._verdicts = dict(
+                (key, bool(verdict)) for key, verdict in self._connection.execute(
+                    "SELECT word_hash, verdict FROM config_verdicts WHERE fingerprint = ?", (fingerprint,)))
+        # Write back buffered verdicts when the process exits, including pool workers
+        self._finalizer = util.Finalize(
+            self, VerdictStore._close, (self._lock, self._connection, fingerprint, self._pending),
+            exitpriority=10)
+
+    @classmethod
+    def for_detector(cls, path: str, detector, warm: bool = True) -> "VerdictStore":
+        """Open a verdict store for a detector's configuration."""
+        return cls(path, detector.fingerprint, warm)
+
+    def __reduce__(self):
+        """Pickle as the path and fingerprint; workers open the file once per process."""
+        return (_open_once, (self.path, self.fingerprint, self.warm))
+
+    def __len__(self):
+        with self._lock:
+            stored = self._connection.execute(
+                "SELECT COUNT(*) FROM config_verdicts WHERE fingerprint = ?", (self.fingerprint,)).fetchone()[0]
+            return stored + len(self._pending)
+
+    def get(self, word: str) -> Optional[bool]:
+        """Get the stored verdict for a word, or None if it is not stored."""
+        key = _signed(word_hash(word))
+        verdict = self._verdicts.get(key)
+        if verdict is None and not self.warm:
+            verdict = self._pending.get(key)
+            if verdict is None:
+                with self._lock:
+                    row = self._connection.execute(
+                        "SELECT verdict FROM config_verdicts WHERE fingerprint = ? AND word_hash = ?",
+                        (self.fingerprint, key)).fetchone()
+                verdict = None if row is None else bool(row[0])
+        if verdict is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return verdict
+
+    def set(self, word: str, verdict: bool):
+        """Store the verdict for a word (written back on the next flush)."""
+        key = _signed(word_hash(word))
+        if self.warm:
+            self._verdicts[key] = verdict
+        with self._lock:
+            self._pending[key] = verdict
+            if len(self._pending) < FLUSH_EVERY:
+                return
+        self.flush()
+
+    def flush(self):
+        """Write the buffered verdicts to the file."""
+        VerdictStore._flush(self._lock, self._connection, self.fingerprint, self._pending)
+
+    @staticmethod
+    def _flush(lock: threading.Lock, connection: sqlite3.Connection, fingerprint: bytes,
+               pending: Dict[int, bool]):
+        with lock:
+            if not pending:
+                return
+            with connection:
+                connection.executemany(
+                    "INSERT OR REPLACE INTO config_verdicts VALUES (?, ?, ?)",
+                    [(fingerprint, key, int(verdict)) for key, verdict in pending.items()])
+            pending.clear()
+
+    @staticmethod
+    def _close(lock: threading.Lock, connection: sqlite3.Connection, fingerprint: bytes,
+               pending: Dict[int, bool]):
+        VerdictStore._flush(lock, connection, fingerprint, pending)
+        connection.close()
+
+    def stats(self) -> Dict[str, int]:
+        """Get the hit and miss counts."""
+        return {'hits': self.hits, 'misses': self.misses}
+
+    def close(self):
+        """Write back buffered verdicts and close the file."""
+        self._finalizer()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __repr__(self):
+        return f"VerdictStore({self.path!r})"
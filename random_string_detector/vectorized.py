@@ -0,0 +1,223 @@
+"""Batched NumPy implementations of the detector heuristics.
+
+NumPy is an optional dependency: install it with `pip install random-string-detector[numpy]`.
+"""
+from typing import Dict, List, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised only without numpy
+    np = None
+
+
+def _require_numpy():
+    """Raise an informative error if NumPy is not installed."""
+    if np is None:
+        raise ImportError(
+            "random_string_detector.vectorized requires numpy: "
+            "pip install random-string-detector[numpy]")
+
+
+def encode_words(words: Sequence[str]) -> Tuple["np.ndarray", "np.ndarray"]:
+    """Encode words as a zero-padded matrix of code points.
+
+    Args:
+    - words: sequence of words to encode
+
+    Returns:
+    - (codes, lengths): a (len(words), max_length) uint32 array of code points and
+      an array with the length of each word
+    """
+    _require_numpy()
+    lengths = np.fromiter((len(w) for w in words), dtype=np.int64, count=len(words))
+    width = int(lengths.max()) if len(words) else 0
+    codes = np.zeros((len(words), width), dtype=np.uint32)
+    for row, word in enumerate(words):
+        if word:
+            codes[row, :len(word)] = np.frombuffer(word.encode('utf-32-le'), dtype=np.uint32)
+    return codes, lengths
+
+
+def has_sequential_run_batch(codes: "np.ndarray", lengths: "np.ndarray",
+                             min_length: int = 4, reverse: bool = False) -> "np.ndarray":
+    """Batched version of detector.has_sequential_run over code point arrays.
+
+    Args:
+    - codes: (n, width) array of code points, as returned by encode_words
+    - lengths: length of each row of codes
+    - min_length: minimum number of characters in the run
+    - reverse: whether descending runs such as "fedcba" also count
+
+    Returns:
+    - boolean array, True for rows that contain a sequential run
+    """
+    _require_numpy()
+    steps = min_length - 1
+    n, width = codes.shape
+    if width < 2 or steps < 1:
+        return np.zeros(n, dtype=bool)
+
+    diffs = np.diff(codes.astype(np.int64), axis=1)
+    # Differences that reach into the zero padding are not part of the word
+    valid = np.arange(width - 1) < (lengths[:, None] - 1)
+
+    result = np.zeros(n, dtype=bool)
+    for step in ((1, -1) if reverse else (1,)):
+        run = (diffs == step) & valid
+        # run[:, i] stays True iff steps consecutive differences starting at i match
+        for _ in range(1, steps):
+            run = run[:, :-1] & run[:, 1:]
+        result |= run.any(axis=1)
+    return result
+
+
+SCREEN_UNDECIDED = -1
+
+# Character classes of ASCII codes for the pre-screen, and their lowercase forms
+_DIGIT, _ALPHA, _HEX = 1, 2, 4
+
+
+def _ascii_tables():
+    classes = np.zeros(128, dtype=np.uint8)
+    classes[ord('0'):ord('9') + 1] = _DIGIT | _HEX
+    classes[ord('a'):ord('z') + 1] = _ALPHA
+    classes[ord('A'):ord('Z') + 1] = _ALPHA
+    classes[ord('a'):ord('f') + 1] |= _HEX
+    classes[ord('A'):ord('F') + 1] |= _HEX
+    lower = np.arange(128, dtype=np.uint8)
+    lower[ord('A'):ord('Z') + 1] += 32
+    return classes, lower
+
+
+def prescreen_batch(detector, words: Sequence[str]) -> "np.ndarray":
+    """Decide the words whose is_random_word verdict follows from character counts alone.
+
+    The screen counts character classes (letters, digits, hex digits), class
+    changes, bigrams containing a digit and distinct characters of each word.
+    These bound the bigram ratios of the full check from below: with
+    allow_numbers, the bigrams containing a digit all count as uncommon for
+    hex-like, alternating or fragmented words, and a word of k distinct
+    characters has at most k * k distinct bigrams, so the rest are duplicated.
+    A word is only decided when the bound already crosses the threshold (or
+    when an earlier rule applies), so decided words get the same verdict as
+    is_random_word; the rest are left undecided.
+
+    Words with non-ASCII characters, or shorter than 4 characters, are left undecided.
+
+    Args:
+    - detector: the RandomStringDetector whose verdicts are screened
+    - words: sequence of words
+
+    Returns:
+    - int8 array: 1 for random words, 0 for words that are not, SCREEN_UNDECIDED otherwise
+    """
+    _require_numpy()
+    result = np.full(len(words), SCREEN_UNDECIDED, dtype=np.int8)
+    chosen = [i for i, word in enumerate(words) if len(word) >= 4 and word.isascii()]
+    if not chosen:
+        return result
+    chosen_words = [words[i] for i in chosen]
+    n = len(chosen)
+    lengths = np.fromiter(map(len, chosen_words), dtype=np.int64, count=n)
+    # Words are concatenated rather than padded, so a long word does not widen every row
+    codes = np.frombuffer(''.join(chosen_words).encode('ascii'), dtype=np.uint8)
+    starts = np.zeros(n, dtype=np.int64)
+    np.cumsum(lengths[:-1], out=starts[1:])
+
+    class_table, lower_table = _ascii_tables()
+    classes = class_table[codes]
+    is_digit = (classes & _DIGIT).astype(bool)
+    is_alpha = (classes & _ALPHA).astype(bool)
+
+    # Pairs of adjacent characters, except those across two words; the pairs
+    # of a word start at the same offset as its characters
+    inside = np.ones(len(codes) - 1, dtype=bool)
+    inside[starts[1:] - 1] = False
+
+    def per_word(values):
+        return np.add.reduceat(values, starts, dtype=np.int64)
+
+    num_bigrams = lengths - 1
+    digits = per_word(is_digit)
+    letters = per_word(is_alpha)
+    hex_digits = per_word((classes & _HEX).astype(bool))
+    digit_changes = per_word((is_digit[:-1] != is_digit[1:]) & inside)
+    alpha_changes = per_word((is_alpha[:-1] != is_alpha[1:]) & inside)
+    digit_bigrams = per_word((is_digit[:-1] | is_digit[1:]) & inside)
+    seen = np.zeros(n * 128, dtype=bool)
+    seen[np.repeat(np.arange(0, n * 128, 128), lengths) + lower_table[codes]] = True
+    distinct = np.count_nonzero(seen.reshape(n, 128), axis=1)
+    # The repeated character rule is case-sensitive, unlike the bigram rules
+    repeated = per_word(codes != np.repeat(codes[starts], lengths)) == 0
+
+    # Same features as detector._WordFeatures, _looks_like_hex and _has_alternating_pattern
+    hex_like = (lengths >= 8) & (hex_digits / lengths > 0.8)
+    alternating = (lengths >= 6) & (alpha_changes / num_bigrams > 0.6)
+    digit_bigrams_uncommon = (
+        alternating | hex_like
+        | ((lengths < 10) & ((letters < 6) | (digits / lengths > 0.3)))
+        | ((lengths >= 10) & (digit_changes + 1 >= 3)))
+    unique_lengths, length_index = np.unique(lengths, return_inverse=True)
+    uncommon_threshold = np.array([detector._adjusted_uncommon_threshold(length)
+                                   for length in unique_lengths.tolist()])[length_index]
+
+    random_by_bigrams = (num_bigrams - distinct * distinct) / num_bigrams > detector.duplicated_bigrams_threshold
+    random_by_bigrams |= repeated
+    if detector.allow_numbers:
+        random_by_bigrams |= digit_bigrams_uncommon & (digit_bigrams / num_bigrams > uncommon_threshold)
+        # Only digits is random before any bigram is counted
+        random_by_bigrams |= digits == lengths
+        decided = np.where(random_by_bigrams, 1, SCREEN_UNDECIDED)
+    else:
+        decided = np.where(letters < lengths, 0, np.where(random_by_bigrams, 1, SCREEN_UNDECIDED))
+    if detector.max_token_length is not None:
+        decided = np.where(lengths > detector.max_token_length, 1, decided)
+    result[chosen] = decided
+    return result
+
+
+def screen_words(detector, words: Sequence[str], min_length: int = 16) -> Tuple[List[bool], Dict[str, int]]:
+    """Check words with is_random_word, pre-screening the long ones in a batch.
+
+    Words of at least min_length characters go through prescreen_batch first,
+    and only those it leaves undecided (and the shorter words) go through
+    detector.is_random_word. Without allow_numbers, words that are not
+    alphabetic skip the screen, since is_random_word rejects them at once.
+    Verdicts are the same as with is_random_word alone,
+    but screened words do not go through the detector's verdict cache or tracer.
+
+    Args:
+    - detector: a RandomStringDetector
+    - words: sequence of words
+    - min_length: minimum length of the words to pre-screen (at least 4)
+
+    Returns:
+    - (verdicts, stats): the verdict of each word, in order, and the number of
+      words decided by each stage: "screened_random", "screened_not_random"
+      and "full" (is_random_word)
+    """
+    _require_numpy()
+    if min_length < 4:
+        raise ValueError("min_length must be at least 4 characters")
+    if detector.allow_numbers:
+        long_words = [i for i, word in enumerate(words) if len(word) >= min_length]
+    else:
+        long_words = [i for i, word in enumerate(words) if len(word) >= min_length and word.isalpha()]
+    screened = prescreen_batch(detector, [words[i] for i in long_words])
+    verdicts = [None] * len(words)
+    for i, decision in zip(long_words, screened.tolist()):
+        if decision != SCREEN_UNDECIDED:
+            verdicts[i] = decision == 1
+    screened_random = int((screened == 1).sum())
+    screened_not_random = int((screened == 0).sum())
+
+    is_random_word = detector.is_random_word
+    for i, verdict in enumerate(verdicts):
+        if verdict is None:
+            verdicts[i] = is_random_word(words[i])
+    stats = {
+        'screened_random': screened_random,
+        'screened_not_random': screened_not_random,
+        'full': len(words) - screened_random - screened_not_random,
+    }
+    return verdicts, stats